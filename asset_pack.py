@@ -0,0 +1,190 @@
+# asset_pack.py
+#
+# Single-file asset archive, memory-mapped and decoded per entry on first
+# use. Images are stored pre-scaled as raw RGBA, sounds as PCM already in
+# the mixer's format and fonts as their TTF bytes, so a launch from the pack
+# skips the PNG decode, the smoothscale, the WAV parse and the font lookup.
+# Without a pack (or for entries it lacks) loaders fall back to loose files.
+#
+#   python asset_pack.py build [assets.pak]
+#
+# Layout (little-endian): header, then count entries of
+#   name (48 bytes, NUL padded), kind, offset, size, a, b
+# where a, b are width and height for images and frequency and channels for
+# sounds, then the entry data.
+
+import io
+import mmap
+import os
+import struct
+import sys
+import pygame
+from utils import resource_path
+
+MAGIC = b"ASPK"
+VERSION = 1
+PACK_FILE = "assets.pak"
+
+HEADER = struct.Struct("<4sHHI")
+ENTRY = struct.Struct("<48sBxxxIIII")
+
+IMAGE, SOUND, FONT = 1, 2, 3
+SAMPLE_SIZE = -16       # signed 16 bit PCM, the only format packs store
+
+_pack = False           # not looked for yet
+
+
+class AssetPack:
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, _, count = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not an asset pack: {path}")
+        if version != VERSION:
+            raise ValueError(f"Unsupported asset pack version: {version}")
+
+        self.entries = {}
+        pos = HEADER.size
+        for _ in range(count):
+            name, kind, offset, size, a, b = ENTRY.unpack_from(self.mm, pos)
+            pos += ENTRY.size
+            self.entries[name.rstrip(b"\0").decode("utf-8")] = (kind, offset, size, a, b)
+
+        self.decoded = {}
+
+    def __contains__(self, name):
+        return name in self.entries
+
+    def data(self, name):
+        kind, offset, size, a, b = self.entries[name]
+        return self.mm[offset:offset + size]
+
+    def image(self, name, size):
+        # Surface, or None when the packed image has another size
+        surface = self.decoded.get(name)
+        if surface is None:
+            kind, offset, length, width, height = self.entries[name]
+            if (width, height) != tuple(size):
+                return None
+            surface = pygame.image.frombuffer(self.data(name), (width, height), "RGBA").convert_alpha()
+            self.decoded[name] = surface
+        return surface
+
+    def sound(self, name):
+        # Sound, or None when the mixer runs another format than the pack
+        sound = self.decoded.get(name)
+        if sound is None:
+            kind, offset, length, frequency, channels = self.entries[name]
+            if pygame.mixer.get_init() != (frequency, SAMPLE_SIZE, channels):
+                return None
+            sound = pygame.mixer.Sound(buffer=self.data(name))
+            self.decoded[name] = sound
+        return sound
+
+    def font_file(self, name):
+        # File object for pygame.font.Font, the bytes are shared
+        data = self.decoded.get(name)
+        if data is None:
+            data = self.decoded[name] = self.data(name)
+        return io.BytesIO(data)
+
+
+def get_pack():
+    global _pack
+    if _pack is False:
+        path = resource_path(PACK_FILE)
+        _pack = AssetPack(path) if os.path.exists(path) else None
+    return _pack
+
+
+# ---------------- LOADERS -----------------
+
+def load_image(path, size):
+    pack = get_pack()
+    if pack is not None and path in pack:
+        surface = pack.image(path, size)
+        if surface is not None:
+            return surface
+
+    image = pygame.image.load(resource_path(path)).convert_alpha()
+    return pygame.transform.smoothscale(image, size)
+
+
+def load_sound(path):
+    pack = get_pack()
+    if pack is not None and path in pack:
+        sound = pack.sound(path)
+        if sound is not None:
+            return sound
+
+    return pygame.mixer.Sound(resource_path(path))
+
+
+def font_entry(bold):
+    return "font/bold" if bold else "font/regular"
+
+
+def packed_font(bold):
+    # File object for the packed UI font, None when the pack has none
+    pack = get_pack()
+    if pack is not None and font_entry(bold) in pack:
+        return pack.font_file(font_entry(bold))
+    return None
+
+
+# ---------------- BUILD -----------------
+
+def build_pack(out_path):
+    from layout import ICON_SIZE
+    from audio import SOUNDS, init_mixer, FREQUENCY, OUTPUT_CHANNELS
+    from fonts import font_path
+
+    pygame.font.init()
+    if not init_mixer():
+        raise RuntimeError("Building sounds needs the mixer, try SDL_AUDIODRIVER=dummy")
+    if pygame.mixer.get_init() != (FREQUENCY, SAMPLE_SIZE, OUTPUT_CHANNELS):
+        raise RuntimeError(f"Mixer opened as {pygame.mixer.get_init()}, expected the audio.py format")
+
+    entries = []    # (name, kind, data, a, b)
+
+    image = pygame.image.load(resource_path("assets/settings.png"))
+    image = pygame.transform.smoothscale(image, (ICON_SIZE, ICON_SIZE))
+    entries.append(("assets/settings.png", IMAGE, pygame.image.tobytes(image, "RGBA"), ICON_SIZE, ICON_SIZE))
+
+    for path in SOUNDS.values():
+        pcm = pygame.mixer.Sound(resource_path(path)).get_raw()
+        entries.append((path, SOUND, pcm, FREQUENCY, OUTPUT_CHANNELS))
+
+    # A bold entry only when there is a real bold face, otherwise the
+    # regular one is made bold at load time like SysFont does
+    regular = font_path(False)
+    for bold, path in ((False, regular), (True, font_path(True))):
+        if path is not None and not (bold and path == regular):
+            with open(path, "rb") as f:
+                entries.append((font_entry(bold), FONT, f.read(), 0, 0))
+
+    offset = HEADER.size + ENTRY.size * len(entries)
+    with open(out_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, len(entries)))
+        for name, kind, data, a, b in entries:
+            f.write(ENTRY.pack(name.encode("utf-8"), kind, offset, len(data), a, b))
+            offset += len(data)
+        for _, _, data, _, _ in entries:
+            f.write(data)
+
+    return [(name, len(data)) for name, _, data, _, _ in entries]
+
+
+if __name__ == "__main__":
+    # python asset_pack.py build [assets.pak]
+    args = sys.argv[1:]
+    if args[:1] != ["build"]:
+        print("usage: asset_pack.py build [out.pak]")
+        sys.exit(2)
+
+    out = args[1] if len(args) > 1 else PACK_FILE
+    for name, size in build_pack(out):
+        print(f"{name:<24} {size:>10,} bytes")
+    print(f"wrote {out}")
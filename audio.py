@@ -0,0 +1,81 @@
+# audio.py
+#
+# Sound effects. The mixer is opened with a small buffer so a blast starts
+# within ~12 ms, and blasts play on a pool of reserved channels: when every
+# voice is busy the oldest one is cut off instead of the new blast being
+# dropped or queued behind it.
+
+import pygame
+from asset_pack import load_sound
+
+SOUNDS = {
+    "blast": "assets/blast.wav",
+}
+
+FREQUENCY = 44100
+SAMPLE_SIZE = -16
+OUTPUT_CHANNELS = 2
+BUFFER_SAMPLES = 512        # default is 4096 on some platforms, ~90 ms
+VOICES = 8                  # reserved channels for effects
+
+
+def init_mixer():
+    # Must run before anything else opens the mixer, returns False when
+    # there is no sound device
+    pygame.mixer.pre_init(FREQUENCY, SAMPLE_SIZE, OUTPUT_CHANNELS, BUFFER_SAMPLES)
+    try:
+        pygame.mixer.init()
+    except pygame.error:
+        return False
+    return True
+
+
+def make_audio():
+    if pygame.mixer.get_init():
+        return PygameAudio()
+    return NullAudio()
+
+
+class PygameAudio:
+    def __init__(self, voices=VOICES):
+        # Decoded samples, filled by preload() or on first play
+        self.sounds = {}
+
+        if pygame.mixer.get_num_channels() < voices:
+            pygame.mixer.set_num_channels(voices)
+        pygame.mixer.set_reserved(voices)
+        self.channels = [pygame.mixer.Channel(i) for i in range(voices)]
+        self.started = [0] * voices     # play counter at each voice's last start
+        self.plays = 0
+
+    def preload(self):
+        for name in SOUNDS:
+            self.sound(name)
+
+    def sound(self, name):
+        sound = self.sounds.get(name)
+        if sound is None:
+            sound = self.sounds[name] = load_sound(SOUNDS[name])
+        return sound
+
+    def voice(self):
+        # A free voice, or steal the one that started longest ago
+        for i, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                return i
+        return min(range(len(self.channels)), key=self.started.__getitem__)
+
+    def play(self, name):
+        i = self.voice()
+        self.plays += 1
+        self.started[i] = self.plays
+        self.channels[i].play(self.sound(name))
+
+
+class NullAudio:
+    # Audio sink for running without a sound device
+    def preload(self):
+        pass
+
+    def play(self, name):
+        pass
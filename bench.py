@@ -0,0 +1,341 @@
+# bench.py
+#
+# Seeded benchmarks for the game's hot paths. Every scenario is
+# reproducible, results are printed as a table and can be written as JSON
+# to compare two commits:
+#
+#   python bench.py --out before.json
+#   python bench.py --out after.json
+#   python bench.py --compare before.json after.json
+#
+# The draw benchmarks run offscreen on the SDL dummy video driver.
+
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import pygame
+
+from headless import HeadlessGame
+from word_sampler import WordIndex, WordSampler
+
+SEED = 1234
+WORD_COUNTS = [10, 100, 1000]
+WORD_LIST_SIZES = [30, 10000, 1000000]
+WINDOW_SIZES = [(800, 600), (1920, 1080), (3840, 2160)]
+REGRESSION_THRESHOLD = 0.10     # flag anything 10% slower
+
+
+def populated_game(word_count, width=800, height=600):
+    # Headless game with word_count words spread over the play area. Words
+    # may overlap and landed ones are culled, so the count stays steady.
+    runner = HeadlessGame(seed=SEED, width=width, height=height)
+    game = runner.game
+    runner.start()
+
+    game.overlap = True
+    game.unique_words = False
+    game.cull_landed = True
+    game.spawn_interval = float("inf")
+
+    rng = random.Random(SEED)
+    for _ in range(word_count):
+        game.spawn_word()
+    for word in game.words:
+        word.y = word.prev_y = rng.uniform(70, height - 120)
+
+    return runner
+
+
+def measure(fn, min_seconds):
+    # Calls fn until min_seconds have passed, returns per-call times
+    times = []
+    started = time.perf_counter()
+    while time.perf_counter() - started < min_seconds:
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return times
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    i = min(len(sorted_values) - 1, int(round(p / 100 * (len(sorted_values) - 1))))
+    return sorted_values[i]
+
+
+def result(name, params, times, batch=1, extra=None):
+    times = sorted(times)
+    total = sum(times)
+    entry = {
+        "name": name,
+        "params": params,
+        "ops_per_sec": round(len(times) * batch / total, 1) if total else 0.0,
+        "p50_ms": round(percentile(times, 50) * 1000, 4),
+        "p95_ms": round(percentile(times, 95) * 1000, 4),
+        "p99_ms": round(percentile(times, 99) * 1000, 4),
+    }
+    if extra:
+        entry.update(extra)
+    return entry
+
+
+def alloc_peak_per_call(fn, calls=20):
+    # Peak bytes allocated while fn runs, averaged over a few calls
+    tracemalloc.start()
+    peaks = []
+    for _ in range(calls):
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        fn()
+        peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+    return int(sum(peaks) / len(peaks))
+
+
+# ---------------- SCENARIOS -----------------
+
+def bench_update(seconds):
+    for count in WORD_COUNTS:
+        runner = populated_game(count)
+        runner.game.word_speed = 0      # same work per step, words never land
+        times = measure(runner.game.step, seconds)
+        yield result("update", {"words": count}, times, extra={
+            "alloc_bytes_per_op": alloc_peak_per_call(runner.game.step)
+        })
+
+
+def bench_typing(seconds):
+    for count in WORD_COUNTS:
+        runner = populated_game(count)
+        game = runner.game
+        rng = random.Random(SEED)
+        texts = [w.text for w in game.words]
+
+        # A partial word then backspace to empty, never completes a word
+        def keystrokes():
+            text = rng.choice(texts)
+            for char in text[:-1]:
+                game.handle_typing(char)
+            for _ in text[:-1]:
+                game.handle_typing("\b")
+
+        times = measure(keystrokes, seconds)
+        average_keys = sum(2 * (len(t) - 1) for t in texts) / len(texts)
+        yield result("handle_typing", {"words": count}, times, batch=average_keys)
+
+
+def bench_safe_x(seconds):
+    # The allocator keeps every on-screen word clear of the others, so a
+    # window only ever holds a handful of spans. Measured empty, half full
+    # and full, labelled by the spans actually occupied.
+    for width, height in WINDOW_SIZES:
+        runner = populated_game(0, width, height)
+        game = runner.game
+        rng = random.Random(SEED)
+
+        # Occupy spans like real spawns would, until the row is full
+        spans = []
+        while True:
+            text = game.sampler.sample_any()
+            x = game.get_safe_x(text)
+            if x is None:
+                break
+            spans.append((object(), x, game.text_width(text)))
+            game.placement.occupy(*spans[-1])
+
+        texts = [game.sampler.sample_any() for _ in range(64)]
+        for occupied in sorted({0, len(spans) // 2, len(spans)}):
+            game.placement.clear()
+            for span in spans[:occupied]:
+                game.placement.occupy(*span)
+
+            times = measure(lambda: game.get_safe_x(rng.choice(texts)), seconds)
+            yield result("get_safe_x", {
+                "window": f"{width}x{height}",
+                "occupied": occupied
+            }, times)
+
+
+def bench_random_word(seconds):
+    for size in WORD_LIST_SIZES:
+        rng = random.Random(SEED)
+        words = [
+            "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(3, 12)))
+            for _ in range(size)
+        ]
+        index = WordIndex(words)
+
+        for count in WORD_COUNTS:
+            sampler = WordSampler(index, random.Random(SEED))
+            for _ in range(min(count, size // 2)):
+                sampler.reserve(sampler.sample() or sampler.sample_any())
+
+            times = measure(sampler.sample, seconds)
+            yield result("get_random_word", {"list_size": size, "on_screen": count}, times)
+
+
+def bench_draw(seconds):
+    from renderer import Renderer
+    from ui_state import UiState
+
+    pygame.display.init()
+    pygame.font.init()
+    pygame.display.set_mode((1, 1))
+
+    for width, height in WINDOW_SIZES:
+        screen = pygame.Surface((width, height))
+        renderer = Renderer()
+        ui = UiState(width, height)
+
+        for count in WORD_COUNTS:
+            runner = populated_game(count, width, height)
+            game = runner.game
+            game.word_renderer = renderer.word_renderer
+            for word in game.words:
+                renderer.word_renderer.prepare(word)
+
+            def frame():
+                game.step()
+                renderer.draw(screen, game, ui)
+
+            game.word_speed = 0
+            frame()     # warm the glyph and text caches
+            times = measure(frame, seconds)
+            yield result("draw", {"window": f"{width}x{height}", "words": count}, times, extra={
+                "alloc_bytes_per_frame": alloc_peak_per_call(frame)
+            })
+
+
+def recorded_game(difficulty, ticks):
+    # A seeded bot types the lowest word every few ticks
+    from replay import Recording, KEY_BASE
+
+    runner = HeadlessGame(seed=SEED, difficulty=difficulty)
+    game = runner.game
+    recording = Recording(SEED, difficulty, 800, 600)
+    rng = random.Random(SEED)
+
+    runner.start()
+    while runner.ticks < ticks and not game.game_over:
+        if game.words and rng.random() < 0.3:
+            target = max(game.words, key=lambda w: w.y)
+            char = target.text[len(game.current_input):][:1] or target.text[0]
+            recording.events.append((game.steps, ord(char) + KEY_BASE, char))
+            game.handle_typing(char)
+        runner.step()
+    return recording
+
+
+def bench_replay(seconds):
+    from replay import play
+
+    for difficulty in ["easy", "hard", "stress"]:
+        recording = recorded_game(difficulty, 3000)
+        runs = []
+        times = measure(lambda: runs.append(play(recording).ticks), seconds)
+        yield result("replay", {"difficulty": difficulty}, times, batch=sum(runs) / len(runs))
+
+
+SCENARIOS = {
+    "update": bench_update,
+    "typing": bench_typing,
+    "safe_x": bench_safe_x,
+    "random_word": bench_random_word,
+    "draw": bench_draw,
+    "replay": bench_replay,
+}
+
+
+# ---------------- REPORTING -----------------
+
+def metadata():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except OSError:
+        commit = ""
+
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "platform": platform.platform(),
+        "seed": SEED,
+        "timestamp": int(time.time()),
+    }
+
+
+def key(entry):
+    return entry["name"] + " " + " ".join(f"{k}={v}" for k, v in sorted(entry["params"].items()))
+
+
+def print_table(results):
+    for entry in results:
+        print(
+            f"{key(entry):<55} {entry['ops_per_sec']:>14,.1f} ops/s"
+            f"  p50 {entry['p50_ms']:.3f}  p95 {entry['p95_ms']:.3f}  p99 {entry['p99_ms']:.3f} ms"
+        )
+
+
+def compare(before_path, after_path):
+    with open(before_path) as f:
+        before = {key(e): e for e in json.load(f)["results"]}
+    with open(after_path) as f:
+        after = {key(e): e for e in json.load(f)["results"]}
+
+    regressions = 0
+    for name, new in after.items():
+        old = before.get(name)
+        if old is None or not old["ops_per_sec"]:
+            continue
+
+        ratio = new["ops_per_sec"] / old["ops_per_sec"]
+        flag = ""
+        if ratio < 1 - REGRESSION_THRESHOLD:
+            flag = "  << slower"
+            regressions += 1
+        print(f"{name:<55} {old['ops_per_sec']:>14,.1f} -> {new['ops_per_sec']:>14,.1f}  x{ratio:.2f}{flag}")
+
+    return regressions
+
+
+def main(args):
+    if args[:1] == ["--compare"]:
+        return 1 if compare(args[1], args[2]) else 0
+
+    out = None
+    if "--out" in args:
+        out = args[args.index("--out") + 1]
+    seconds = 0.05 if "--quick" in args else 0.5
+    only = [a for a in args if a in SCENARIOS]
+
+    results = []
+    for name, scenario in SCENARIOS.items():
+        if only and name not in only:
+            continue
+        for entry in scenario(seconds):
+            results.append(entry)
+            print_table([entry])
+
+    if out:
+        with open(out, "w") as f:
+            json.dump({"meta": metadata(), "results": results}, f, indent=2)
+
+    return 0
+
+
+if __name__ == "__main__":
+    # python bench.py [update typing safe_x random_word draw replay] [--quick] [--out FILE]
+    sys.exit(main(sys.argv[1:]))
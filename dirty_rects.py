@@ -0,0 +1,71 @@
+import pygame
+
+MAX_DIRTY_RECTS = 24
+
+
+class DirtyRectTracker:
+    # Remembers where every tracked region was drawn last frame and what it
+    # showed, regions that moved or changed are reported as dirty.
+    def __init__(self):
+        self.previous = {}      # key -> (rect, state)
+        self.current = {}
+        self.dirty = []
+        self.full_rect = None
+
+    def invalidate(self, rect):
+        # Force a full repaint of rect (resize, screen switch)
+        self.full_rect = pygame.Rect(rect)
+
+    def track(self, key, rect, state):
+        rect = pygame.Rect(rect)
+        self.current[key] = (rect, state)
+
+        old = self.previous.get(key)
+        if old is None:
+            self.dirty.append(rect)
+        elif old[0] != rect or old[1] != state:
+            self.dirty.append(old[0])
+            self.dirty.append(rect)
+
+    def flush(self):
+        # Regions that disappeared since last frame
+        for key, (rect, _) in self.previous.items():
+            if key not in self.current:
+                self.dirty.append(rect)
+
+        if self.full_rect is not None:
+            rects = [self.full_rect]
+        else:
+            rects = merge_rects(self.dirty)
+
+        self.previous = self.current
+        self.current = {}
+        self.dirty = []
+        self.full_rect = None
+
+        return rects
+
+
+def merge_rects(rects):
+    merged = []
+
+    for rect in rects:
+        if rect.width <= 0 or rect.height <= 0:
+            continue
+
+        # Grow the rect until it no longer overlaps anything already merged
+        i = 0
+        while i < len(merged):
+            if merged[i].colliderect(rect):
+                rect = rect.union(merged.pop(i))
+                i = 0
+            else:
+                i += 1
+
+        merged.append(rect)
+
+    # Too many small repaints cost more than one big one
+    if len(merged) > MAX_DIRTY_RECTS:
+        return [merged[0].unionall(merged[1:])]
+
+    return merged
@@ -0,0 +1,81 @@
+# fonts.py
+#
+# Resolves the UI font file once and remembers it in ~/.type_in_time, so a
+# restart does not pay for pygame's system font scan (fc-list on Linux) the
+# way every SysFont call can. Font objects are shared per (name, size, bold).
+# A font stored in the asset pack wins over the system UI font.
+
+import json
+import os
+import pygame
+from utils import user_data_path, ensure_data_dir
+from asset_pack import packed_font
+
+FONT_NAME = "arial"
+CACHE_FILE = "fonts.json"
+
+_paths = None
+_fonts = {}
+
+
+def load_paths():
+    try:
+        with open(user_data_path(CACHE_FILE), "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_paths(paths):
+    try:
+        ensure_data_dir()
+        with open(user_data_path(CACHE_FILE), "w") as f:
+            json.dump(paths, f)
+    except OSError:
+        pass    # a read-only home only costs the scan next time
+
+
+def font_path(bold=False, name=FONT_NAME):
+    # Font file for name (comma separated fallbacks like SysFont), None
+    # means pygame's default font. Only found files are remembered, a
+    # missing font is looked for again next time.
+    global _paths
+    if _paths is None:
+        _paths = load_paths()
+
+    key = f"{name} bold" if bold else name
+    path = _paths.get(key)
+    if path is not None and os.path.exists(path):
+        return path
+
+    path = pygame.font.match_font(name, bold=bold)
+    if path is not None:
+        _paths[key] = path
+        save_paths(_paths)
+    return path
+
+
+def get_font(size, bold=False, name=FONT_NAME):
+    key = (name, size, bold)
+    font = _fonts.get(key)
+    if font is None:
+        font = _fonts[key] = load_font(size, bold, name)
+    return font
+
+
+def load_font(size, bold, name):
+    # The asset pack only carries the UI font
+    if name == FONT_NAME:
+        packed = packed_font(bold)
+        if packed is not None:
+            return pygame.font.Font(packed, size)
+        if bold and packed_font(False) is not None:
+            font = pygame.font.Font(packed_font(False), size)
+            font.set_bold(True)
+            return font
+
+    path = font_path(bold, name)
+    font = pygame.font.Font(path, size)
+    if bold and path in (None, font_path(False, name)):
+        font.set_bold(True)     # no bold face, same fallback as SysFont
+    return font
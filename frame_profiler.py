@@ -0,0 +1,154 @@
+# frame_profiler.py
+#
+# Per-phase frame timing for the main loop. Phases are timed with a single
+# perf_counter call per mark, percentiles are only computed when the overlay
+# refreshes, so leaving it on costs next to nothing.
+
+import time
+from collections import deque
+import pygame
+from text_cache import text_cache
+from fonts import get_font
+
+PHASES = ["events", "update", "scene", "hud", "words", "game_over", "present", "tick"]
+WINDOW = 300                # frames kept for the rolling percentiles
+REFRESH_FRAMES = 15         # overlay redraw rate, in frames
+
+OVERLAY_BG = (20, 20, 20, 200)
+OVERLAY_TEXT = (230, 230, 230)
+OVERLAY_FONT = "consolas,couriernew,monospace"
+
+
+class NullProfiler:
+    # Used when profiling is off
+    overlay = False
+
+    def begin_frame(self):
+        pass
+
+    def mark(self, phase):
+        pass
+
+    def end_frame(self):
+        pass
+
+
+class FrameProfiler:
+    def __init__(self, out_path=None, window=WINDOW):
+        self.history = {phase: deque(maxlen=window) for phase in PHASES + ["frame"]}
+        self.current = dict.fromkeys(PHASES, 0.0)
+        self.frame_start = 0.0
+        self.last = 0.0
+        self.frames = 0
+
+        self.overlay = False
+        self.overlay_surface = None
+        self.overlay_size = None    # fixed after the first render
+        self.font = None
+
+        # Optional per-frame CSV stream
+        self.out = None
+        if out_path:
+            self.out = open(out_path, "w", buffering=1 << 16)
+            self.out.write("frame," + ",".join(PHASES) + ",total\n")
+
+    def begin_frame(self):
+        self.frame_start = self.last = time.perf_counter()
+        for phase in self.current:
+            self.current[phase] = 0.0
+
+    def mark(self, phase):
+        # Time since the previous mark is charged to phase
+        now = time.perf_counter()
+        self.current[phase] += now - self.last
+        self.last = now
+
+    def end_frame(self):
+        total = self.last - self.frame_start
+        self.frames += 1
+
+        for phase, seconds in self.current.items():
+            self.history[phase].append(seconds)
+        self.history["frame"].append(total)
+
+        if self.out is not None:
+            values = ",".join(f"{self.current[p] * 1000:.3f}" for p in PHASES)
+            self.out.write(f"{self.frames},{values},{total * 1000:.3f}\n")
+
+    def close(self):
+        if self.out is not None:
+            self.out.close()
+            self.out = None
+
+    # ---------------- STATS -----------------
+
+    def percentiles(self, phase):
+        values = sorted(self.history[phase])
+        if not values:
+            return 0.0, 0.0, 0.0
+
+        def pick(p):
+            return values[min(len(values) - 1, int(p * len(values)))] * 1000
+
+        return pick(0.50), pick(0.95), pick(0.99)
+
+    # ---------------- OVERLAY -----------------
+
+    def toggle_overlay(self):
+        self.overlay = not self.overlay
+        self.overlay_surface = None
+
+    def overlay_rect(self):
+        if self.overlay_surface is None:
+            return pygame.Rect(0, 0, 0, 0)
+        return self.overlay_surface.get_rect(topleft=(10, 75))
+
+    def draw_overlay(self, screen):
+        if self.overlay_surface is None or self.frames % REFRESH_FRAMES == 0:
+            self.overlay_surface = self.render_overlay()
+
+        screen.blit(self.overlay_surface, self.overlay_rect())
+
+    def render_overlay(self):
+        if self.font is None:
+            self.font = get_font(14, name=OVERLAY_FONT)
+
+        lines = ["phase        p50    p95    p99 ms"]
+        for phase in PHASES + ["frame"]:
+            p50, p95, p99 = self.percentiles(phase)
+            lines.append(f"{phase:<10} {p50:6.2f} {p95:6.2f} {p99:6.2f}")
+
+        stats = text_cache.stats()
+        lines.append(f"text cache {stats['hits']:>8} hit {stats['misses']:>6} miss")
+
+        line_height = self.font.get_linesize()
+        if self.overlay_size is None:
+            width = max(self.font.size(line)[0] for line in lines) + 40
+            self.overlay_size = (width, line_height * len(lines) + 12)
+
+        surface = pygame.Surface(self.overlay_size, pygame.SRCALPHA)
+        surface.fill(OVERLAY_BG)
+
+        for i, line in enumerate(lines):
+            surface.blit(self.font.render(line, True, OVERLAY_TEXT), (8, 6 + i * line_height))
+
+        return surface
+
+
+class StartupTimer:
+    # Wall time of each startup step, printed with --startup-report
+    def __init__(self, started):
+        self.started = self.last = started
+        self.steps = []
+
+    def mark(self, step):
+        now = time.perf_counter()
+        self.steps.append((step, now - self.last))
+        self.last = now
+
+    def report(self):
+        lines = ["Startup:"]
+        for step, seconds in self.steps:
+            lines.append(f"  {step:<12} {seconds * 1000:8.1f} ms")
+        lines.append(f"  {'total':<12} {(self.last - self.started) * 1000:8.1f} ms")
+        return "\n".join(lines)
@@ -0,0 +1,26 @@
+import time
+import pygame
+
+
+class SystemClock:
+    # Real time, what the windowed game uses
+    def ticks(self):
+        return pygame.time.get_ticks()      # milliseconds
+
+    def time(self):
+        return time.time()                  # seconds
+
+
+class ManualClock:
+    # Time only moves when advanced, for headless runs faster than real time
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def advance(self, seconds):
+        self.now += seconds
+
+    def ticks(self):
+        return int(self.now * 1000)
+
+    def time(self):
+        return self.now
@@ -12,45 +12,68 @@ DIFFICULTY_SETTINGS = {
     "hard": {
         "fall_speed": 3.5,
         "spawn_interval": 1.2
+    },
+    # Benchmark mode: thousands of words on screen, landed words are culled
+    # instead of ending the game
+    "stress": {
+        "fall_speed": 1.0,
+        "spawn_interval": 0,
+        "spawn_batch": 6,
+        "store": "array",
+        "unique_words": False,
+        "overlap": True,
+        "cull_landed": True
     }
 }
 
+# Fixed simulation rate, fall_speed is pixels per step
+SIMULATION_HZ = 30
+STEP_SECONDS = 1 / SIMULATION_HZ
+MAX_FRAME_SECONDS = 0.25    # drop time after a stall instead of catching up
+
 MIN_WORD_GAP = 60
 LEFT_MARGIN = 40
 RIGHT_MARGIN = 40
 
-import pygame
-import time
 import random
-from words import get_random_word
-import json
-import os
-from utils import resource_path
-
-def user_data_path(filename):
-    return os.path.join(os.path.expanduser("~"), ".type_in_time", filename)
-
-def ensure_data_dir():
-    path = os.path.join(os.path.expanduser("~"), ".type_in_time")
-    os.makedirs(path, exist_ok=True)
-
-class FallingWord:
-    def __init__(self, text, x, y):
-        self.text = text
-        self.x = x
-        self.y = y
-        self.speed = 1
-    
-    def move(self, speed):
-        self.y += speed
+from words import new_sampler
+from prefix_index import PrefixIndex
+from placement import PlacementAllocator
+from word_store import make_store
+import getpass
+from game_clock import SystemClock
+from audio import make_audio
+from utils import user_data_path, ensure_data_dir
+from session_store import SessionStore
+from typing_stats import TypingStats
+
+def default_player():
+    try:
+        return getpass.getuser()
+    except Exception:
+        return "player"
 
 class GameLogic:
-    def __init__(self, width, height):
+    def __init__(self, width, height, clock=None, rng=None, audio=None, persist_scores=True, player=None):
         self.width = width
         self.height = height
 
-        self.words = []
+        # Injectable for headless runs (see headless.py)
+        self.clock = clock if clock is not None else SystemClock()
+        self.rng = rng if rng is not None else random
+        self.persist_scores = persist_scores
+        self.player = player or default_player()
+        self.sessions = None    # SessionStore, when scores persist
+        self.recorder = None    # replay.Recorder, when recording
+        self.steps = 0          # simulation steps since the game started
+        self.stats = TypingStats()  # rolling WPM, accuracy, per-key timings
+
+        self.words = make_store("list")
+        self.word_index = PrefixIndex()     # prefix lookup for typing
+        self.sampler = new_sampler(self.rng)    # word source, excludes on-screen words
         self.active_word = None     # word currently being typed
+        self.word_renderer = None   # set by the UI to pre-render spawned words
+        self.placement = PlacementAllocator(MIN_WORD_GAP, self.rng)   # occupied x spans
 
         self.started = False
         self.paused = False
@@ -70,29 +93,36 @@ class GameLogic:
         self.apply_difficulty()
 
         self.current_input = ""
-        self.last_spawn_time = time.time()
+        self.spawn_timer = 0.0      # simulated seconds since last spawn
+        self.accumulator = 0.0      # real seconds not yet simulated
         self.spawn_interval = 2     #seconds
 
         
         # Sound
-        self.blast_sound = pygame.mixer.Sound(resource_path("assets/blast.wav"))
+        self.audio = audio if audio is not None else make_audio()
     
     def start(self):
+        if self.recorder is not None and not self.game_over:
+            self.recorder.start(self)
+
         self.active = True
         self.paused = False
         
-        self.start_time = time.time()
-        self.words.clear()
+        self.start_time = self.clock.time()
+        self.clear_words()
         self.current_input = ""
-        self.last_spawn_time = time.time()
+        self.spawn_timer = 0.0
+        self.accumulator = 0.0
 
         if self.started or self.game_over:
             return
         
         self.started = True
+        self.steps = 0
+        self.stats.reset(self.clock.time())
         
         self.paused = False
-        self.last_update_time = pygame.time.get_ticks()
+        self.last_update_time = self.clock.ticks()
         
         self.apply_difficulty()
     
@@ -103,11 +133,14 @@ class GameLogic:
         self.paused = not self.paused
 
         if not self.paused:
-            self.last_update_time = pygame.time.get_ticks()
+            self.last_update_time = self.clock.ticks()
 
     
     def reset(self):
-        self.words.clear()
+        if self.recorder is not None:
+            self.recorder.finish(self)
+
+        self.clear_words()
         self.current_input = ""
         self.elapsed_time = 0.0
         self.active_word = None
@@ -118,9 +151,11 @@ class GameLogic:
         self.active = True
         self.started = False
 
-        self.start_time = time.time()
-        self.last_spawn_time = time.time()
+        self.start_time = self.clock.time()
+        self.spawn_timer = 0.0
+        self.accumulator = 0.0
         self.last_update_time = None
+        self.stats.reset(self.start_time)
 
         self.apply_difficulty()
     
@@ -129,101 +164,218 @@ class GameLogic:
         if not self.started or self.paused or self.game_over:
             return
         
-        now = pygame.time.get_ticks()
+        now = self.clock.ticks()
         delta = (now - self.last_update_time) / 1000    # conver ms - seconds
-        self.elapsed_time += delta
         self.last_update_time = now
 
+        self.advance(delta)
+
+    def advance(self, seconds):
+        # Run as many fixed steps as the frame time covers, the remainder is
+        # carried over and used to interpolate drawing
+        self.accumulator += min(seconds, MAX_FRAME_SECONDS)
+
+        while self.accumulator >= STEP_SECONDS:
+            self.accumulator -= STEP_SECONDS
+            self.step()
+
+            if self.game_over:
+                break
+
+    def interpolation(self):
+        # How far between the last two steps the screen should be drawn
+        return min(self.accumulator / STEP_SECONDS, 1.0)
+
+    def step(self):
+        if not self.started or self.paused or self.game_over:
+            return
+
+        self.elapsed_time += STEP_SECONDS
+        self.steps += 1
+
         if not self.active or self.game_over or self.paused:
             return
         
-        # Spawn word every two seconds
-        now = time.time()
-        if now - self.last_spawn_time >= self.spawn_interval:
-            existing_words = [w.text for w in self.words]
-            new_text = get_random_word(existing_words)
-
-            x = self.get_safe_x(new_text)
-            new_word = FallingWord(new_text, x, 70)
-            
-            self.words.append(new_word)
-            self.last_spawn_time = now
+        # Spawn word every spawn_interval seconds
+        self.spawn_timer += STEP_SECONDS
+        if self.spawn_timer >= self.spawn_interval:
+            for _ in range(self.spawn_batch):
+                if self.spawn_word():
+                    self.spawn_timer = 0.0
         
         # Move words
-        for word in self.words[:]:
-            word.move(self.word_speed)
-
-            # If words reaches bottom - game over
-            if word.y >= self.height - 80:
-                self.game_over = True
-                self.calculate_speed()
-                self.check_high_score()
-                self.active = False
-                self.elapsed_time = int(time.time() - self.start_time)
-                self.current_input = ""
-                self.active_word = None
-                return  # STOP: update immediately
-    
+        landed = self.words.move(self.word_speed, self.height - 80)
+
+        if landed and self.cull_landed:
+            for word in landed:
+                if word is self.active_word:
+                    self.current_input = ""
+                    self.word_index.reset()
+                    self.active_word = None
+            self.remove_words(landed)
+
+        # If words reaches bottom - game over
+        elif landed:
+            self.game_over = True
+            self.calculate_speed()
+            self.check_high_score()
+            self.active = False
+            self.elapsed_time = int(self.clock.time() - self.start_time)
+            self.record_session()
+            if self.recorder is not None:
+                self.recorder.finish(self)
+            self.current_input = ""
+            self.word_index.reset()
+            self.active_word = None
+
+    def spawn_word(self):
+        if self.unique_words:
+            new_text = self.sampler.sample()
+            if new_text is None:
+                new_text = self.sampler.sample_any()    #fallback (rare)
+        else:
+            new_text = self.sampler.sample_any()
+
+        if self.overlap:
+            x = self.get_random_x(new_text)
+        else:
+            x = self.get_safe_x(new_text)
+
+        # No free space left, try again next step
+        if x is None:
+            return False
+
+        new_word = self.words.add(new_text, x, 70)
+        if self.word_renderer is not None:
+            self.word_renderer.prepare(new_word)
+
+        self.word_index.add(new_word)
+        self.sampler.reserve(new_text)
+        if not self.overlap:
+            self.placement.occupy(new_word, x, self.text_width(new_text))
+
+        return True
+
+    def remove_word(self, word):
+        self.words.remove(word)
+        self.word_index.remove(word)
+        self.sampler.release(word.text)
+        self.placement.release(word)
+
+    def remove_words(self, words):
+        # Same as remove_word for each, with one pass over the store
+        self.words.remove_many(words)
+        for word in words:
+            self.word_index.remove(word)
+            self.sampler.release(word.text)
+            self.placement.release(word)
+
+    def clear_words(self):
+        # Drop every word, in the store the current difficulty asks for
+        settings = DIFFICULTY_SETTINGS[self.difficulty]
+        self.words = make_store(settings.get("store", "list"))
+        self.word_index.clear()
+        self.sampler.release_all()
+        self.placement.clear()
+
+    def resize(self, width, height):
+        # Keep each word at the same relative x inside the new playfield,
+        # then rebuild the occupied spans from the moved words
+        old_right = self.width - RIGHT_MARGIN
+        self.width = width
+        self.height = height
+        if self.recorder is not None:
+            self.recorder.resize(self)
+
+        self.placement.clear()
+        for word in self.words:
+            text_width = self.text_width(word.text)
+            old_span = max(1, old_right - text_width - LEFT_MARGIN)
+            new_span = max(0, width - RIGHT_MARGIN - text_width - LEFT_MARGIN)
+            share = min(1.0, max(0.0, (word.x - LEFT_MARGIN) / old_span))
+            word.x = LEFT_MARGIN + int(share * new_span)
+
+            if not self.overlap:
+                self.placement.occupy(word, word.x, text_width)
+
     def handle_typing(self, char):
+        # Returns True when the input still matches (or completed) a word
+        if self.recorder is not None:
+            self.recorder.key(self, char)
+
         if not self.active or self.game_over:
-            return
+            return False
+
+        # Char the active word wants next, for the error hotspots
+        expected = None
+        if self.active_word is not None and len(self.current_input) < len(self.active_word.text):
+            expected = self.active_word.text[len(self.current_input)]
 
+        words_typed = self.words_typed
+        matched = self.apply_key(char)
+        self.stats.key(self.clock.time(), char, expected, matched, self.words_typed > words_typed)
+        return matched
+
+    def apply_key(self, char):
         # Handle backspace
         if char == "\b":
             self.current_input = self.current_input[:-1]
+            self.word_index.pop()
         else:
             self.current_input += char
+            self.word_index.push(char)
 
         # If nothing typed, reset active word
         if self.current_input == "":
             self.active_word = None
-            return
+            return False
 
-        # Find all matching words
-        matching_words = [
-            w for w in self.words
-            if w.text.startswith(self.current_input)
-        ]
+        # TOP-MOST word starting with the input
+        match = self.word_index.top()
 
         # No match → reset input and active word
-        if not matching_words:
+        if match is None:
             self.current_input = ""
+            self.word_index.reset()
             self.active_word = None
-            return
+            return False
 
-        # Select the TOP-MOST matching word
-        self.active_word = min(matching_words, key=lambda w: w.y)
+        self.active_word = match
 
         # Full word typed
         if self.current_input == self.active_word.text:
-            self.words.remove(self.active_word)
+            self.remove_word(self.active_word)
             self.words_typed += 1
             self.current_input = ""
-            self.blast_sound.play()
+            self.word_index.reset()
+            self.audio.play("blast")
             self.active_word = None
+
+        return True
     
-    def get_safe_x(self, word_text):
-        word_width = len(word_text) * 14    # approximate width per length
-        max_attempts = 20
+    def text_width(self, word_text):
+        if self.word_renderer is not None:
+            width = self.word_renderer.text_width(word_text)
+        else:
+            width = len(word_text) * 14    # approximate width per length
 
-        for _ in range(max_attempts):
-            x = random.randint(
-                LEFT_MARGIN,
-                self.width - RIGHT_MARGIN - word_width
-            )
+        # Placement depends on font metrics, a replay needs the same widths
+        if self.recorder is not None:
+            self.recorder.width(self, word_text, width)
+        return width
 
-            # Check spacing against existing words
-            safe = True
-            for w in self.words:
-                if abs(w.x - x) < word_width + MIN_WORD_GAP:
-                    safe = False
-                    break
-            
-            if safe:
-                return x
-            
-        # Fallback (rare)
-        return LEFT_MARGIN
+    def get_safe_x(self, word_text):
+        # Random x clear of every on-screen word, None if there is no room
+        return self.placement.allocate(
+            self.text_width(word_text),
+            LEFT_MARGIN,
+            self.width - RIGHT_MARGIN
+        )
+    
+    def get_random_x(self, word_text):
+        # Anywhere in the play area, overlapping other words is allowed
+        right = self.width - RIGHT_MARGIN - self.text_width(word_text)
+        return self.rng.randint(LEFT_MARGIN, max(LEFT_MARGIN, int(right)))
     
     def get_elapsed_time(self):
         if not self.active and not self.game_over:
@@ -235,8 +387,14 @@ class GameLogic:
         if self.game_over:
             return self.elapsed_time
         
-        return int(time.time() - self.start_time)
+        return int(self.clock.time() - self.start_time)
     
+    def get_live_speed(self):
+        # Rolling WPM while playing, the final speed once the game is over
+        if self.started and not self.game_over:
+            return self.stats.rolling_wpm(self.clock.time())
+        return self.get_speed()
+
     def get_speed(self):
         elapsed = self.get_elapsed_time()
 
@@ -249,18 +407,10 @@ class GameLogic:
         settings = DIFFICULTY_SETTINGS[self.difficulty]
         self.word_speed = settings["fall_speed"]
         self.spawn_interval = settings["spawn_interval"]
-
-        if self.difficulty == "Easy":
-            self.word_speed = 60
-            self.spawn_interval = 2000
-        
-        elif self.difficulty == "Medium":
-            self.word_speed = 90
-            self.spawn_interval = 1400
-        
-        elif self.difficulty == "Hard":
-            self.word_speed = 130
-            self.spawn_interval = 900
+        self.spawn_batch = settings.get("spawn_batch", 1)
+        self.unique_words = settings.get("unique_words", True)
+        self.overlap = settings.get("overlap", False)
+        self.cull_landed = settings.get("cull_landed", False)
     
     def set_difficulty(self, difficulty):
         difficulty = difficulty.lower()
@@ -268,37 +418,53 @@ class GameLogic:
         if difficulty in DIFFICULTY_SETTINGS:
             self.difficulty = difficulty
             self.apply_difficulty()
+            if self.recorder is not None:
+                self.recorder.difficulty(self)
         else:
             raise ValueError(f"Invalid difficulty: {difficulty}")
     
     def load_high_score(self):
-        ensure_data_dir()
-        path = user_data_path("highscore.json")
-
-        if not os.path.exists(path):
-            self.high_scores = {"easy": 0, "medium": 0, "hard": 0}
-            self.save_high_scores()
+        self.high_scores = {"easy": 0, "medium": 0, "hard": 0}
+        if not self.persist_scores:
             return
-        
-        with open(path, "r") as f:
-            self.high_scores = json.load(f)
-    
-    def save_high_scores(self):
+
         ensure_data_dir()
-        path = user_data_path("highscore.json")
+        self.sessions = SessionStore(user_data_path("sessions.db"))
+        self.high_scores.update(self.sessions.import_legacy(user_data_path("highscore.json")))
+        self.high_scores.update(self.sessions.high_scores())
+
+    def record_session(self):
+        # Queued, the store writes on its own thread
+        if self.sessions is not None:
+            stats = self.stats.snapshot(self.clock.time())
+            self.sessions.record(
+                self.player,
+                self.difficulty,
+                self.speed,
+                self.words_typed,
+                self.elapsed_time,
+                accuracy=self.stats.accuracy(),
+                keys=stats["keys"],
+                inter_key_ms=stats["inter_key_ms"],
+                slowest_chars=stats["slowest_chars"],
+                hotspots=stats["hotspots"]
+            )
 
-        with open(path, "w") as f:
-            json.dump(self.high_scores, f, indent=4)
+    def close(self):
+        if self.recorder is not None:
+            self.recorder.finish(self)
+            self.recorder.close()
+        if self.sessions is not None:
+            self.sessions.close()
     
     def get_current_high_score(self):
         return self.high_scores.get(self.difficulty, 0)
     
     def check_high_score(self):
-        current_high = self.high_scores[self.difficulty]
+        current_high = self.high_scores.get(self.difficulty, 0)
 
         if self.speed > current_high:
             self.high_scores[self.difficulty] = self.speed
-            self.save_high_scores()
             self.new_high_score = True
         else:
             self.new_high_score = False
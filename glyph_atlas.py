@@ -0,0 +1,116 @@
+import pygame
+
+ATLAS_SIZE = 512
+GLYPH_PADDING = 1
+
+
+class GlyphAtlas:
+    # Every (font, character, color) is rasterized once into a shared
+    # surface, words are then drawn by blitting sub-rects of it.
+    def __init__(self, size=ATLAS_SIZE):
+        self.surface = pygame.Surface((size, size), pygame.SRCALPHA)
+        self.glyphs = {}        # (font, char, color) -> (area rect, advance)
+
+        # Shelf packing state
+        self.shelf_x = 0
+        self.shelf_y = 0
+        self.shelf_height = 0
+
+    def glyph(self, font, char, color):
+        key = (font, char, color)
+        glyph = self.glyphs.get(key)
+
+        if glyph is None:
+            glyph = self.add_glyph(font, char, color)
+            self.glyphs[key] = glyph
+
+        return glyph
+
+    def add_glyph(self, font, char, color):
+        glyph_surface = font.render(char, True, color)
+        w, h = glyph_surface.get_size()
+
+        # Next shelf if this row is full
+        if self.shelf_x + w > self.surface.get_width():
+            self.shelf_x = 0
+            self.shelf_y += self.shelf_height + GLYPH_PADDING
+            self.shelf_height = 0
+
+        # Grow the atlas downwards if out of rows
+        if self.shelf_y + h > self.surface.get_height():
+            self.grow(self.shelf_y + h)
+
+        area = pygame.Rect(self.shelf_x, self.shelf_y, w, h)
+        self.surface.blit(glyph_surface, area.topleft)
+
+        self.shelf_x += w + GLYPH_PADDING
+        self.shelf_height = max(self.shelf_height, h)
+
+        return area, w
+
+    def grow(self, min_height):
+        width, height = self.surface.get_size()
+        while height < min_height:
+            height *= 2
+
+        new_surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        new_surface.blit(self.surface, (0, 0))
+        self.surface = new_surface
+
+    def text_width(self, font, text, color):
+        return sum(self.glyph(font, char, color)[1] for char in text)
+
+    def add_text(self, blit_list, font, text, pos, colors):
+        # Append blit tuples for text at pos, colors is one color per letter
+        x, y = pos
+
+        for char, color in zip(text, colors):
+            area, advance = self.glyph(font, char, color)
+            blit_list.append((self.surface, (x, y), area))
+            x += advance
+
+        return x - pos[0]
+
+
+class WordRenderer:
+    # Renders a whole word once from atlas glyphs, the highlighted variant
+    # is only rebuilt when the matched prefix length changes.
+    def __init__(self, atlas, font, color, highlight_color):
+        self.atlas = atlas
+        self.font = font
+        self.color = color
+        self.highlight_color = highlight_color
+
+    def render(self, text, matched=0):
+        colors = [self.highlight_color] * matched + [self.color] * (len(text) - matched)
+        width = sum(
+            self.atlas.glyph(self.font, char, color)[1]
+            for char, color in zip(text, colors)
+        )
+
+        surface = pygame.Surface((max(width, 1), self.font.get_height()), pygame.SRCALPHA)
+        blit_list = []
+        self.atlas.add_text(blit_list, self.font, text, (0, 0), colors)
+        surface.blits(blit_list, doreturn=False)
+        return surface
+
+    def text_width(self, text):
+        return self.atlas.text_width(self.font, text, self.color)
+
+    def prepare(self, word):
+        word.surface = self.render(word.text)
+        word.highlight_len = 0
+        word.highlight_surface = None
+
+    def surface_for(self, word, matched):
+        if word.surface is None:
+            self.prepare(word)
+
+        if matched <= 0:
+            return word.surface
+
+        if word.highlight_surface is None or word.highlight_len != matched:
+            word.highlight_surface = self.render(word.text, matched)
+            word.highlight_len = matched
+
+        return word.highlight_surface
@@ -0,0 +1,114 @@
+# headless.py
+#
+# Runs GameLogic without a display or sound device, stepping a manual clock
+# so a whole game takes as long as the CPU needs, not as long as it lasts.
+
+import random
+import sys
+import time
+from game_clock import ManualClock
+from audio import NullAudio
+from game_logic import GameLogic, STEP_SECONDS
+
+
+class HeadlessGame:
+    # One tick is one fixed simulation step of GameLogic
+    def __init__(self, seed=0, difficulty="easy", width=800, height=600):
+        self.clock = ManualClock()
+        self.rng = random.Random(seed)
+        self.ticks = 0
+
+        self.game = GameLogic(
+            width,
+            height,
+            clock=self.clock,
+            rng=self.rng,
+            audio=NullAudio(),
+            persist_scores=False
+        )
+        self.game.set_difficulty(difficulty)
+
+    def start(self):
+        self.game.start()
+
+    def step(self, ticks=1):
+        for _ in range(ticks):
+            self.clock.advance(STEP_SECONDS)
+            self.ticks += 1
+            self.game.step()
+
+    def type(self, text):
+        for char in text:
+            self.game.handle_typing(char)
+
+    def run(self, script=(), max_ticks=100000):
+        # script: (tick, text) pairs in tick order, "\b" is backspace.
+        # Runs until game over or max_ticks and returns a summary.
+        script = iter(script)
+        pending = next(script, None)
+
+        self.start()
+        while self.ticks < max_ticks and not self.game.game_over:
+            while pending is not None and pending[0] <= self.ticks:
+                self.type(pending[1])
+                pending = next(script, None)
+            self.step()
+
+        return self.summary()
+
+    def summary(self):
+        game = self.game
+        game.calculate_speed()
+        stats = game.stats.snapshot(self.clock.time())
+        return {
+            "ticks": self.ticks,
+            "seconds": round(self.clock.time(), 3),
+            "game_over": game.game_over,
+            "words_typed": game.words_typed,
+            "on_screen": len(game.words),
+            "speed": game.speed,
+            "accuracy": stats["accuracy"] if stats["accuracy"] is not None else "-",
+            "inter_key_ms": stats["inter_key_ms"] if stats["inter_key_ms"] is not None else "-",
+            "slowest_chars": stats["slowest_chars"],
+            "hotspots": stats["hotspots"],
+        }
+
+
+def load_script(path):
+    # One "tick<TAB>text" line per burst of keystrokes
+    script = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if not line:
+                continue
+            tick, text = line.split("\t", 1)
+            script.append((int(tick), text.replace("\\b", "\b")))
+    return script
+
+
+if __name__ == "__main__":
+    # python headless.py [script.tsv] [--seed N] [--difficulty hard] [--ticks N]
+    args = sys.argv[1:]
+
+    def option(name, default):
+        if name in args:
+            i = args.index(name)
+            value = args[i + 1]
+            del args[i:i + 2]
+            return value
+        return default
+
+    seed = int(option("--seed", 0))
+    difficulty = option("--difficulty", "easy")
+    max_ticks = int(option("--ticks", 100000))
+    script = load_script(args[0]) if args else []
+
+    runner = HeadlessGame(seed=seed, difficulty=difficulty)
+    started = time.perf_counter()
+    result = runner.run(script, max_ticks=max_ticks)
+    elapsed = time.perf_counter() - started
+
+    for key, value in result.items():
+        print(f"{key}: {value}")
+    print(f"ticks/sec: {result['ticks'] / elapsed:.0f}")
@@ -0,0 +1,71 @@
+# input_latency.py
+#
+# Keystroke-to-photon latency: every key event is timestamped when the loop
+# takes it off the queue, and charged when the frame showing its effect is
+# presented. pygame does not expose SDL's own event timestamps, so time spent
+# in the SDL queue before the loop polls is not included.
+
+import time
+
+BUCKET_MS = 1
+MAX_MS = 250        # anything slower lands in the last bucket
+
+
+class LatencyRecorder:
+    def __init__(self):
+        self.buckets = [0] * (MAX_MS // BUCKET_MS + 1)
+        self.pending = []
+        self.count = 0
+        self.total = 0.0
+
+    def key_received(self):
+        self.pending.append(time.perf_counter())
+
+    def presented(self):
+        if not self.pending:
+            return
+
+        now = time.perf_counter()
+        for received in self.pending:
+            ms = (now - received) * 1000
+            self.buckets[min(int(ms // BUCKET_MS), len(self.buckets) - 1)] += 1
+            self.count += 1
+            self.total += ms
+        self.pending.clear()
+
+    def percentile(self, p):
+        if not self.count:
+            return 0.0
+
+        target = p * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= target:
+                return (i + 1) * BUCKET_MS
+        return MAX_MS
+
+    def report(self):
+        if not self.count:
+            return "No keystrokes recorded"
+
+        lines = [
+            f"Keystroke-to-photon latency over {self.count} keys:",
+            f"  mean {self.total / self.count:.1f} ms"
+            f"  p50 <={self.percentile(0.50)} ms"
+            f"  p95 <={self.percentile(0.95)} ms"
+            f"  p99 <={self.percentile(0.99)} ms",
+        ]
+
+        # Histogram in 5 ms rows, up to the slowest non-empty bucket
+        last = max(i for i, n in enumerate(self.buckets) if n)
+        rows = [
+            (start, sum(self.buckets[start:start + 5]))
+            for start in range(0, last + 1, 5)
+        ]
+        peak = max(n for _, n in rows)
+        for start, n in rows:
+            bar = "#" * max(1 if n else 0, int(40 * n / peak))
+            lines.append(f"  {start * BUCKET_MS:>4}-{(start + 5) * BUCKET_MS:<4} ms {n:>6} {bar}")
+
+        return "\n".join(lines)
@@ -0,0 +1,62 @@
+# layout.py
+#
+# Every rect and position of the game screen, computed once per window size.
+# Drawing and hit testing read from here instead of redoing the math each
+# frame; the caches built from these rects are dropped on resize.
+
+import pygame
+
+ICON_SIZE = 18
+ICON_PADDING = 20
+
+# Button Creation
+BUTTON_WIDTH = 120
+BUTTON_HEIGHT = 40
+BUTTON_GAP = 30
+
+# Result panel size
+PANEL_WIDTH = 420
+PANEL_HEIGHT = 260
+
+MARGIN = 40             # left and right edge of lines, HUD and input box
+TOP_LINE_Y = 65
+HUD_Y = 25
+HUD_FIELDS = 4
+
+
+class Layout:
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+
+        self.settings_rect = pygame.Rect(width - ICON_SIZE - ICON_PADDING, 18, ICON_SIZE, ICON_SIZE)
+
+        # Divider lines, (start, end) points
+        self.top_line = ((MARGIN, TOP_LINE_Y), (width - MARGIN, TOP_LINE_Y))
+        self.ground_line = ((MARGIN, height - 80), (width - MARGIN, height - 80))
+
+        # HUD fields are centered in equal slots
+        self.hud_slot = (width - 2 * MARGIN) // HUD_FIELDS
+        self.hud_slots = [MARGIN + i * self.hud_slot for i in range(HUD_FIELDS)]
+
+        self.input_box = pygame.Rect(MARGIN, height - 140, width - 2 * MARGIN, 40)
+
+        total_width = (BUTTON_WIDTH * 3) + (BUTTON_GAP * 2)
+        start_x = (width - total_width) // 2
+        button_y = height - 60
+        self.start_button = pygame.Rect(start_x, button_y, BUTTON_WIDTH, BUTTON_HEIGHT)
+        self.pause_button = pygame.Rect(start_x + BUTTON_WIDTH + BUTTON_GAP, button_y, BUTTON_WIDTH, BUTTON_HEIGHT)
+        self.reset_button = pygame.Rect(start_x + (BUTTON_WIDTH + BUTTON_GAP) * 2, button_y, BUTTON_WIDTH, BUTTON_HEIGHT)
+
+        self.panel = pygame.Rect(
+            (width - PANEL_WIDTH) // 2,
+            (height - PANEL_HEIGHT) // 2,
+            PANEL_WIDTH,
+            PANEL_HEIGHT
+        )
+
+    def hud_positions(self, surfaces):
+        return [
+            (x + (self.hud_slot - surface.get_width()) // 2, HUD_Y)
+            for x, (_, surface) in zip(self.hud_slots, surfaces)
+        ]
@@ -0,0 +1,67 @@
+import bisect
+import random
+
+
+class PlacementAllocator:
+    # Occupied horizontal spans of the on-screen words, kept sorted so a free
+    # x position can be drawn uniformly from the remaining space in one pass.
+    def __init__(self, gap, rng=None):
+        self.gap = gap
+        self.rng = rng if rng is not None else random
+
+        self.spans = []     # sorted (start, end, id)
+        self.owners = {}    # id -> span
+
+    def occupy(self, owner, x, width):
+        span = (x, x + width, id(owner))
+        bisect.insort(self.spans, span)
+        self.owners[id(owner)] = span
+
+    def release(self, owner):
+        span = self.owners.pop(id(owner), None)
+        if span is None:
+            return
+
+        i = bisect.bisect_left(self.spans, span)
+        if i < len(self.spans) and self.spans[i] == span:
+            del self.spans[i]
+
+    def clear(self):
+        self.spans.clear()
+        self.owners.clear()
+
+    def free_segments(self, width, left, right):
+        # Inclusive ranges of x where a word of this width keeps MIN gap
+        # from every occupied span
+        segments = []
+        cursor = left
+        last = right - width
+
+        for start, end, _ in self.spans:
+            seg_end = min(start - self.gap - width, last)
+            if seg_end >= cursor:
+                segments.append((cursor, seg_end))
+            cursor = max(cursor, end + self.gap)
+
+            if cursor > last:
+                break
+
+        if last >= cursor:
+            segments.append((cursor, last))
+
+        return segments
+
+    def allocate(self, width, left, right):
+        # Uniformly random free x, or None when the row is full
+        segments = self.free_segments(int(width), int(left), int(right))
+
+        total = sum(end - start + 1 for start, end in segments)
+        if total == 0:
+            return None
+
+        pick = self.rng.randrange(total)
+        for start, end in segments:
+            size = end - start + 1
+            if pick < size:
+                return start + pick
+            pick -= size
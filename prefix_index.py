@@ -0,0 +1,96 @@
+class PrefixNode:
+    __slots__ = ("children", "words")
+
+    def __init__(self):
+        self.children = {}
+        self.words = {}     # words under this prefix, in spawn order
+
+
+class PrefixIndex:
+    # Trie over the on-screen words with a typing cursor, so each keystroke
+    # follows a single edge instead of scanning every word. Words can fall
+    # at their own speed, so the top-most match is picked by y among the
+    # words under the cursor, not by spawn order.
+    def __init__(self):
+        self.root = PrefixNode()
+        self.prefix = ""
+        self.path = [self.root]
+
+    def add(self, word):
+        node = self.root
+        node.words[word] = None
+
+        for char in word.text:
+            child = node.children.get(char)
+            if child is None:
+                child = node.children[char] = PrefixNode()
+            node = child
+            node.words[word] = None
+
+        # The cursor may hold missing or pruned nodes this word just created
+        if self.prefix:
+            self.walk()
+
+    def remove(self, word):
+        node = self.root
+        node.words.pop(word, None)
+        prune = None
+
+        for char in word.text:
+            child = node.children.get(char)
+            if child is None:
+                break
+
+            # Drop the word all the way down, the cursor may still hold
+            # nodes below the pruned one
+            child.words.pop(word, None)
+            if not child.words and prune is None:
+                prune = (node, char)
+
+            node = child
+
+        # Nothing left below this prefix
+        if prune is not None:
+            parent, char = prune
+            del parent.children[char]
+
+    def clear(self):
+        self.root = PrefixNode()
+        self.reset()
+
+    # ---------------- CURSOR -----------------
+
+    def walk(self):
+        node = self.root
+        self.path = [node]
+
+        for char in self.prefix:
+            node = node.children.get(char) if node is not None else None
+            self.path.append(node)
+
+    def reset(self):
+        self.prefix = ""
+        self.path = [self.root]
+
+    def push(self, char):
+        node = self.path[-1]
+        self.prefix += char
+        self.path.append(node.children.get(char) if node is not None else None)
+
+    def pop(self):
+        if len(self.path) > 1:
+            self.prefix = self.prefix[:-1]
+            self.path.pop()
+
+    def top(self):
+        # Top-most word matching the typed prefix, or None
+        node = self.path[-1]
+        if node is None or not node.words:
+            return None
+
+        # Same pick as the old min(y) scan, the oldest word wins a tie
+        return min(node.words, key=top_key)
+
+
+def top_key(word):
+    return word.y
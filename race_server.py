@@ -0,0 +1,424 @@
+# race_server.py
+#
+# Typing races: one asyncio process hosts many rooms, every player in a
+# room gets their own headless GameLogic fed from the room's seeded word
+# stream, so everyone races the same words in the same order.
+#
+#   python race_server.py serve [--port 7878] [--players 2] [--difficulty hard]
+#   python race_server.py load [--port 7878] [--typists 300] [--rooms 30] [--wpm 60]
+#
+# The protocol is newline-delimited JSON over TCP. A client sends
+# {"join": room, "name": name} once, then keystroke batches {"k": "pyth"}
+# ("\b" is backspace). The server answers with {"room", "seed",
+# "difficulty", "speed"} and from then on one delta per tick in which
+# something changed:
+#
+#   {"t": tick, "+": [[id, text, x, y], ...], "-": [id, ...], "w": words,
+#    "i": input, "o": 1}
+#
+# "+" are spawned words, "-" removed ones (typed or culled), "o" is sent
+# once on game over. Words fall at "speed" pixels per tick, clients move
+# them locally. When every player is out the room sends {"end": results}.
+
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+from headless import HeadlessGame
+from game_logic import SIMULATION_HZ, STEP_SECONDS
+from word_sampler import WordSampler
+import words
+
+PORT = 7878
+MAX_BATCH = 64          # keystrokes accepted per message
+MAX_PENDING_KEYS = 64   # keystrokes queued per tick, the rest is dropped
+MAX_WRITE_BUFFER = 256 * 1024   # unsent bytes before a client counts as stalled
+RECENT_WORDS = 8        # the stream does not repeat a word this soon
+REPORT_SECONDS = 5
+TICK_HISTORY = 1000     # room ticks kept for the latency percentiles
+
+
+def encode(message):
+    return (json.dumps(message, separators=(",", ":")) + "\n").encode()
+
+
+def send(writer, message):
+    # Ticks never wait on a socket. A client that stops reading is closed
+    # once its unsent data passes MAX_WRITE_BUFFER; returns False then.
+    if writer.is_closing():
+        return False
+    writer.write(encode(message))
+    if writer.transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+        writer.close()
+        return False
+    return True
+
+
+class WordStream:
+    # The room's word sequence, generated once and shared by every player
+    def __init__(self, seed):
+        self.sampler = WordSampler(words.word_index, random.Random(seed))
+        self.texts = []
+
+    def __getitem__(self, i):
+        while len(self.texts) <= i:
+            text = self.sampler.sample(exclude=set(self.texts[-RECENT_WORDS:]))
+            self.texts.append(text or self.sampler.sample_any())
+        return self.texts[i]
+
+
+class StreamCursor:
+    # Stands in for GameLogic.sampler, handing out the stream in order. A
+    # word only counts as used once it is reserved, so a spawn that found
+    # no room retries the same word.
+    def __init__(self, stream):
+        self.stream = stream
+        self.position = 0
+
+    def sample(self, *args, **kwargs):
+        return self.stream[self.position]
+
+    def sample_any(self):
+        return self.stream[self.position]
+
+    def reserve(self, text):
+        self.position += 1
+
+    def release(self, text):
+        pass
+
+    def release_all(self):
+        pass
+
+
+class Player:
+    def __init__(self, name, writer, room):
+        self.name = name
+        self.writer = writer
+        self.keys = []          # queued until the next tick, MAX_PENDING_KEYS at most
+
+        self.runner = HeadlessGame(seed=room.seed, difficulty=room.difficulty)
+        self.game = self.runner.game
+        self.game.sampler = StreamCursor(room.stream)
+
+        self.ids = {}           # word -> id sent to the client
+        self.next_id = 0
+        self.sent_input = ""
+        self.sent_words = 0
+        self.sent_over = False
+
+    def delta(self, tick):
+        # What changed since the last delta, None if nothing did
+        game = self.game
+        message = {}
+
+        current = set(game.words)
+        removed = [self.ids.pop(word) for word in list(self.ids) if word not in current]
+        spawned = []
+        for word in game.words:
+            if word not in self.ids:
+                self.ids[word] = self.next_id
+                spawned.append([self.next_id, word.text, int(word.x), int(word.y)])
+                self.next_id += 1
+
+        if spawned:
+            message["+"] = spawned
+        if removed:
+            message["-"] = removed
+        if game.words_typed != self.sent_words:
+            message["w"] = self.sent_words = game.words_typed
+        if game.current_input != self.sent_input:
+            message["i"] = self.sent_input = game.current_input
+        if game.game_over and not self.sent_over:
+            message["o"] = self.sent_over = 1
+
+        if not message:
+            return None
+        message["t"] = tick
+        return message
+
+
+class Room:
+    def __init__(self, server, name, difficulty, min_players):
+        self.server = server
+        self.name = name
+        self.difficulty = difficulty
+        self.min_players = min_players
+        self.seed = random.SystemRandom().getrandbits(63)
+        self.stream = WordStream(self.seed)
+
+        self.players = []
+        self.tick = 0
+        self.task = None
+
+    def join(self, name, writer):
+        player = Player(name, writer, self)
+        self.players.append(player)
+        send(writer, {
+            "room": self.name,
+            "seed": self.seed,
+            "difficulty": self.difficulty,
+            "speed": player.game.word_speed,
+        })
+
+        if self.task is not None:
+            player.runner.start()       # late joiners start right away
+        elif len(self.players) >= self.min_players:
+            for p in self.players:
+                p.runner.start()
+            self.task = asyncio.ensure_future(self.run())
+        return player
+
+    def leave(self, player):
+        if player in self.players:
+            self.players.remove(player)
+        if not self.players:
+            self.server.close_room(self)
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+
+        while self.players:
+            target = started + self.tick * STEP_SECONDS
+            # Always yield, a room running late must not starve the sockets
+            await asyncio.sleep(max(0.0, target - loop.time()))
+
+            tick_start = time.perf_counter()
+            lateness = max(0.0, loop.time() - target)
+            self.step()
+            self.server.record_tick(time.perf_counter() - tick_start, lateness)
+
+            if all(p.game.game_over for p in self.players):
+                self.finish()
+                return
+
+    def step(self):
+        self.tick += 1
+        for player in list(self.players):
+            game = player.game
+            for char in player.keys:
+                game.handle_typing(char)
+            player.keys.clear()
+            player.runner.step()
+
+            message = player.delta(self.tick)
+            if message is not None and not send(player.writer, message):
+                self.players.remove(player)     # stalled, its handler sees EOF and leaves
+
+    def finish(self):
+        results = []
+        for player in self.players:
+            player.game.calculate_speed()
+            results.append([player.name, player.game.words_typed, player.game.speed])
+        results.sort(key=lambda r: -r[1])
+
+        for player in self.players:
+            send(player.writer, {"end": results})
+        self.server.close_room(self)
+
+
+class RaceServer:
+    def __init__(self, difficulty="easy", min_players=1):
+        self.difficulty = difficulty
+        self.min_players = min_players
+        self.rooms = {}
+
+        self.tick_times = []
+        self.lateness = []
+        self.ticks = 0
+
+    def close_room(self, room):
+        if self.rooms.get(room.name) is room:
+            del self.rooms[room.name]
+
+    def record_tick(self, seconds, lateness):
+        self.ticks += 1
+        self.tick_times.append(seconds)
+        self.lateness.append(lateness)
+        if len(self.tick_times) > TICK_HISTORY:
+            del self.tick_times[:-TICK_HISTORY]
+            del self.lateness[:-TICK_HISTORY]
+
+    async def handle(self, reader, writer):
+        player = room = None
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                message = json.loads(line)
+                if not isinstance(message, dict):
+                    continue
+
+                if player is None:
+                    if "join" not in message:
+                        continue
+                    name = str(message["join"])
+                    room = self.rooms.get(name)
+                    if room is None or room.task is not None and room.task.done():
+                        room = self.rooms[name] = Room(self, name, self.difficulty, self.min_players)
+                    player = room.join(str(message.get("name", "player")), writer)
+                else:
+                    room_left = MAX_PENDING_KEYS - len(player.keys)
+                    player.keys.extend(str(message.get("k", ""))[:min(MAX_BATCH, room_left)])
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            if room is not None:
+                room.leave(player)
+            writer.close()
+
+    def sessions(self):
+        return sum(len(room.players) for room in self.rooms.values())
+
+    async def report(self):
+        # Tick cost, scheduling lateness and an estimate of how many
+        # sessions one core could hold at this per-session cost
+        last_wall, last_cpu = time.perf_counter(), time.process_time()
+        while True:
+            await asyncio.sleep(REPORT_SECONDS)
+            wall, cpu = time.perf_counter(), time.process_time()
+            busy = (cpu - last_cpu) / (wall - last_wall)
+            last_wall, last_cpu = wall, cpu
+
+            sessions = self.sessions()
+            times = sorted(self.tick_times)
+            late = sorted(self.lateness)
+            if not times or not sessions:
+                print(f"rooms {len(self.rooms)}  sessions {sessions}  idle")
+                continue
+
+            def pick(values, p):
+                return values[min(len(values) - 1, int(p * len(values)))] * 1000
+
+            per_core = int(sessions / busy) if busy > 0 else 0
+            print(
+                f"rooms {len(self.rooms)}  sessions {sessions}  cpu {busy:.0%}"
+                f"  tick p50 {pick(times, 0.5):.2f} p99 {pick(times, 0.99):.2f} ms"
+                f"  late p99 {pick(late, 0.99):.2f} ms"
+                f"  ~{per_core} sessions/core"
+            )
+
+    async def serve(self, port):
+        server = await asyncio.start_server(self.handle, "127.0.0.1", port)
+        print(f"race server on 127.0.0.1:{port}, {SIMULATION_HZ} ticks/s, {os.cpu_count()} cores")
+        reporter = asyncio.ensure_future(self.report())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            reporter.cancel()
+
+
+# ---------------- LOAD TEST -----------------
+
+async def typist(port, room, name, wpm, stats):
+    # Types the oldest (lowest) word on its board at wpm, in 100 ms batches,
+    # and times each batch until the server echoes its effect
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(encode({"join": room, "name": name}))
+    await reader.readline()
+
+    board = {}              # id -> text
+    state = {"sent": None, "done": False}
+
+    async def receive():
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            message = json.loads(line)
+            if "end" in message:
+                stats["finished"] += 1
+                break
+
+            stats["deltas"] += 1
+            for word_id, text, x, y in message.get("+", ()):
+                board[word_id] = text
+            for word_id in message.get("-", ()):
+                board.pop(word_id, None)
+            if "w" in message:
+                stats["words"] += 1
+            if state["sent"] is not None and ("i" in message or "w" in message):
+                stats["echo"].append(time.perf_counter() - state["sent"])
+                state["sent"] = None
+        state["done"] = True
+
+    receiver = asyncio.ensure_future(receive())
+    chars_per_batch = wpm * 5 / 60 / 10
+    budget = 0.0
+    target, typed = None, ""
+
+    while not state["done"]:
+        await asyncio.sleep(0.1)
+        if not board:
+            continue
+        if target not in board:
+            target, typed = min(board), ""
+
+        budget += chars_per_batch
+        count = int(budget)
+        batch = board[target][len(typed):len(typed) + count]
+        if batch:
+            budget -= count
+            typed += batch
+            state["sent"] = time.perf_counter()
+            writer.write(encode({"k": batch}))
+
+    await receiver
+    writer.close()
+
+
+async def load_test(port, typists, rooms, wpm):
+    stats = {"deltas": 0, "words": 0, "finished": 0, "echo": []}
+    started = time.perf_counter()
+    tasks = [
+        asyncio.ensure_future(typist(port, f"load-{i % rooms}", f"typist-{i}", wpm, stats))
+        for i in range(typists)
+    ]
+
+    async def progress():
+        while True:
+            await asyncio.sleep(REPORT_SECONDS)
+            elapsed = time.perf_counter() - started
+            echo = sorted(stats["echo"][-TICK_HISTORY:])
+            p50 = echo[len(echo) // 2] * 1000 if echo else 0.0
+            p99 = echo[int(len(echo) * 0.99)] * 1000 if echo else 0.0
+            print(
+                f"{elapsed:6.0f} s  deltas/s {stats['deltas'] / elapsed:,.0f}"
+                f"  words {stats['words']}  finished {stats['finished']}/{typists}"
+                f"  echo p50 {p50:.1f} p99 {p99:.1f} ms"
+            )
+
+    reporter = asyncio.ensure_future(progress())
+    await asyncio.gather(*tasks, return_exceptions=True)
+    reporter.cancel()
+    print(f"done: {stats['finished']} typists finished, {stats['deltas']} deltas")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+
+    def option(name, default):
+        if name in args:
+            return args[args.index(name) + 1]
+        return default
+
+    port = int(option("--port", PORT))
+    if args[:1] == ["load"]:
+        asyncio.run(load_test(
+            port,
+            int(option("--typists", 300)),
+            int(option("--rooms", 30)),
+            float(option("--wpm", 60))
+        ))
+    else:
+        server = RaceServer(option("--difficulty", "easy"), int(option("--players", 1)))
+        try:
+            asyncio.run(server.serve(port))
+        except KeyboardInterrupt:
+            pass
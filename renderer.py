@@ -0,0 +1,377 @@
+import pygame
+from glyph_atlas import GlyphAtlas, WordRenderer
+from asset_pack import load_image
+from frame_profiler import NullProfiler
+from text_cache import render_text
+from fonts import get_font
+from layout import ICON_SIZE, PANEL_WIDTH, PANEL_HEIGHT
+
+# Sky blue color (RGB)
+SKY_BLUE = (255, 206, 235)
+
+# Soft ui colors
+WHITE = (255, 255, 255)
+SOFT_GRAY = (190, 190, 190)
+DARK_GRAY = (100, 100, 100)
+BUTTON_BLUE = (100, 170, 220)
+BUTTON_NORMAL = (100, 170, 220)
+BUTTON_HOVER = (120, 190, 240)
+BUTTON_PRESSED = (70, 140, 190)
+RED = (200, 50, 50)
+RESULT_BG = (245, 250, 255)
+BORDER_COLOR = (150, 180, 210)
+GREEN = (0, 180, 0)
+GOLD = (235, 215, 0)
+LINE_COLOR = (170, 200, 220)        # soft blue gray
+LINE_THICKNESS = 3
+
+
+# Transparent color of the cached layers. Rounded rects are not
+# antialiased, so a colorkey is exact and RLE blits skip the gaps quickly.
+LAYER_KEY = (255, 0, 255)
+
+
+def new_layer(size):
+    layer = pygame.Surface(size)
+    layer.fill(LAYER_KEY)
+    return layer
+
+
+def finish_layer(layer):
+    layer.set_colorkey(LAYER_KEY, pygame.RLEACCEL)
+    return layer
+
+
+class Renderer:
+    def __init__(self):
+        # Fonts
+        self.font_small = get_font(20)
+        self.font_medium = get_font(24)
+        self.font_large = get_font(28)
+        self.font_result = get_font(42, bold=True)
+        self.font_title = get_font(32, bold=True)
+        self.font_speed = get_font(44, bold=True)
+        self.font_hint = get_font(18)
+
+        # Settings icon, loaded on first draw
+        self._settings_icon = None
+
+        # Shared glyph atlas for falling words
+        self.glyph_atlas = GlyphAtlas()
+        self.word_renderer = WordRenderer(self.glyph_atlas, self.font_medium, DARK_GRAY, GREEN)
+
+        # Per-phase timing, swapped for a FrameProfiler when profiling
+        self.profiler = NullProfiler()
+
+        # Pre-drawn input box frame, blitting it clips cleanly where a
+        # thick rounded rect drawn under a clip rect does not
+        self.input_box_surface = None
+
+        # Cached layers, rebuilt when their key changes
+        self.buttons_key = None
+        self.buttons_surface = None
+        self.buttons_pos = (0, 0)
+        self.game_over_key = None
+        self.game_over_surface = None
+        self.game_over_pos = (0, 0)
+
+    @property
+    def settings_icon(self):
+        if self._settings_icon is None:
+            self._settings_icon = load_image("assets/settings.png", (ICON_SIZE, ICON_SIZE))
+        return self._settings_icon
+
+    # ---------------- LAYOUT -----------------
+
+    def invalidate_layout(self):
+        # Drop everything built from the old window size
+        self.input_box_surface = None
+        self.buttons_key = None
+        self.game_over_key = None
+
+    def button_color(self, name, rect, ui):
+        if ui.pressed_button == name:
+            return BUTTON_PRESSED
+        elif rect.collidepoint(ui.mouse_pos):
+            return BUTTON_HOVER
+        else:
+            return BUTTON_NORMAL
+
+    def hud_texts(self, game):
+        # Score , TIme, Words written (horizontal)
+        total_seconds = int(game.elapsed_time)
+        minutes = total_seconds // 60
+        seconds = total_seconds % 60
+
+        return [
+            f"Speed: {game.get_live_speed()} WPM",
+            f"Time: {minutes:02d}:{seconds:02d}",
+            f"Words: {game.words_typed}",
+            f"High: {game.get_current_high_score()} WPM",
+        ]
+
+    def hud_surfaces(self, game):
+        return [
+            (text, render_text(self.font_medium, text, SOFT_GRAY))
+            for text in self.hud_texts(game)
+        ]
+
+    def word_surface(self, game, word):
+        if word is game.active_word:
+            matched = len(game.current_input)
+        else:
+            matched = 0
+
+        return self.word_renderer.surface_for(word, matched)
+
+    # ---------------- DRAWING -----------------
+
+    def draw(self, screen, game, ui):
+        layout = ui.layout
+        profiler = self.profiler
+
+        # Background, divider lines and settings icon
+        self.draw_background(screen, ui)
+        profiler.mark("scene")
+
+        self.draw_hud(screen, game, layout)
+        profiler.mark("hud")
+
+        self.draw_words(screen, game)
+        profiler.mark("words")
+
+        self.draw_input(screen, game, layout)
+        screen.blit(*self.buttons_layer(game, ui))
+        profiler.mark("scene")
+
+        # Game over message
+        if game.game_over:
+            self.draw_game_over(screen, game, layout)
+            profiler.mark("game_over")
+
+        elif ui.current_screen == "settings":
+            ui.settings_screen.draw(screen)
+            profiler.mark("scene")
+
+    # ---------------- LAYERS -----------------
+
+    def draw_background(self, screen, ui):
+        # Drawn directly: a full-window cached surface costs more to blit
+        # than the fill, which only writes each pixel
+        layout = ui.layout
+
+        # Fill background with sky blue color
+        screen.fill(SKY_BLUE)
+
+        # Top Divider line (below score, time, words)
+        pygame.draw.line(screen, LINE_COLOR, *layout.top_line, LINE_THICKNESS)
+
+        # Horizontal divider line above buttons
+        pygame.draw.line(screen, LINE_COLOR, *layout.ground_line, LINE_THICKNESS)
+
+        # Settings icon
+        screen.blit(self.settings_icon, layout.settings_rect.topleft)
+
+    def buttons_layer(self, game, ui):
+        # All three buttons in one surface, redrawn when a label, a hover or
+        # a press changes
+        buttons = [
+            (rect, label, self.button_color(name, rect, ui))
+            for rect, label, name in ui.buttons(game)
+        ]
+        key = tuple((tuple(rect), label, color) for rect, label, color in buttons)
+        if key == self.buttons_key:
+            return self.buttons_surface, self.buttons_pos
+
+        bounds = buttons[0][0].unionall([rect for rect, _, _ in buttons[1:]])
+        layer = new_layer(bounds.size)
+        for rect, label, color in buttons:
+            rect = rect.move(-bounds.x, -bounds.y)
+            pygame.draw.rect(layer, color, rect, border_radius=8)
+            text = render_text(self.font_small, label, WHITE)
+            layer.blit(text, text.get_rect(center=rect.center))
+
+        self.buttons_key = key
+        self.buttons_surface = finish_layer(layer)
+        self.buttons_pos = bounds.topleft
+        return layer, bounds.topleft
+
+    def draw_game_over(self, screen, game, layout):
+        # The result panel is rendered once per game end
+        key = (layout, game.get_speed(), game.words_typed, game.elapsed_time)
+        if key != self.game_over_key:
+            self.game_over_surface, self.game_over_pos = self.render_game_over(game, layout)
+            self.game_over_key = key
+        screen.blit(self.game_over_surface, self.game_over_pos)
+
+        # Can be wider than the panel, so it is not part of the layer
+        if game.new_high_score:
+            congrats_text = render_text(
+                self.font_large,
+                "Congratulations! New High Score!",
+                GOLD
+            )
+            screen.blit(
+                congrats_text,
+                congrats_text.get_rect(center=(layout.width // 2, layout.height // 2 + 40))
+            )
+
+    def draw_hud(self, screen, game, layout):
+        surfaces = self.hud_surfaces(game)
+        positions = layout.hud_positions(surfaces)
+
+        for (_, text_surface), pos in zip(surfaces, positions):
+            screen.blit(text_surface, pos)
+
+    def draw_words(self, screen, game):
+        # Draw falling words (cached per-word surfaces, one batched blit)
+        positions = game.words.positions(game.interpolation())
+        word_blits = [
+            (self.word_surface(game, word), pos)
+            for word, pos in zip(game.words, positions)
+        ]
+        screen.blits(word_blits, doreturn=False)
+
+    def draw_input(self, screen, game, layout):
+        # Typing input area box
+        input_box_rect = layout.input_box
+        if (
+            self.input_box_surface is None or
+            self.input_box_surface.get_size() != input_box_rect.size
+        ):
+            self.input_box_surface = pygame.Surface(input_box_rect.size, pygame.SRCALPHA)
+            frame_rect = self.input_box_surface.get_rect()
+            pygame.draw.rect(self.input_box_surface, WHITE, frame_rect, border_radius=8)
+            pygame.draw.rect(self.input_box_surface, LINE_COLOR, frame_rect, 2, border_radius=8)
+
+        screen.blit(self.input_box_surface, input_box_rect)
+
+        # Typed text display
+        typed_surface = render_text(self.font_medium, game.current_input, DARK_GRAY)
+        screen.blit(
+            typed_surface,
+            (input_box_rect.x + 10, input_box_rect.y + 8)
+        )
+
+    def render_game_over(self, game, layout):
+        # Result panel on its own surface, returns (surface, screen position)
+        panel_rect = layout.panel
+        width = layout.width
+
+        # Text values
+        speed = game.get_speed()
+        words = game.words_typed
+        elapsed = game.elapsed_time
+
+        # Well played
+        title_text = render_text(self.font_title, "------ Game Over ------", DARK_GRAY)
+        title_rect = title_text.get_rect(center=(width // 2, panel_rect.y + 35))
+
+        # Speed (big, red)
+        speed_text = render_text(self.font_speed, f"{speed} WPM", RED)
+        speed_rect = speed_text.get_rect(center=(width // 2, panel_rect.y + 90))
+
+        # WOrds and time
+        stats_text = render_text(
+            self.font_medium,
+            f"Words: {words}    |   Time: {elapsed} sec",
+            GREEN
+        )
+        stats_rect = stats_text.get_rect(center=(width // 2, panel_rect.y + 140))
+
+        texts = [(title_text, title_rect), (speed_text, speed_rect), (stats_text, stats_rect)]
+
+        bounds = panel_rect.copy()
+        layer = new_layer(bounds.size)
+        panel_rect = panel_rect.move(-bounds.x, -bounds.y)
+
+        # pannel background
+        pygame.draw.rect(
+            layer,
+            RESULT_BG,
+            panel_rect,
+            border_radius=12
+        )
+
+        # Panel border
+        pygame.draw.rect(
+            layer,
+            BORDER_COLOR,
+            panel_rect,
+            2,
+            border_radius=12
+        )
+
+        for text, rect in texts:
+            layer.blit(text, rect.move(-bounds.x, -bounds.y))
+
+        # Reset hint box
+        hint_rect = pygame.Rect(
+            panel_rect.x + 80,
+            panel_rect.y + PANEL_HEIGHT - 55,
+            PANEL_WIDTH - 160,
+            30
+        )
+
+        pygame.draw.rect(
+            layer,
+            (230, 240, 250),
+            hint_rect,
+            border_radius=9
+        )
+
+        pygame.draw.rect(
+            layer,
+            BORDER_COLOR,
+            hint_rect,
+            1,
+            border_radius=6
+        )
+
+        hint_text = render_text(
+            self.font_hint,
+            "Click RESET to clear Screen",
+            DARK_GRAY
+        )
+
+        layer.blit(
+            hint_text,
+            hint_text.get_rect(center=hint_rect.center)
+        )
+
+        return finish_layer(layer), bounds.topleft
+
+    # ---------------- DIRTY RECTS -----------------
+
+    def regions(self, game, ui):
+        # (key, rect, state) for everything that can change between frames
+        layout = ui.layout
+        width, height = layout.width, layout.height
+
+        surfaces = self.hud_surfaces(game)
+        positions = layout.hud_positions(surfaces)
+        for i, ((text, surface), pos) in enumerate(zip(surfaces, positions)):
+            yield ("hud", i), surface.get_rect(topleft=pos), text
+
+        positions = game.words.positions(game.interpolation())
+        for word, pos in zip(game.words, positions):
+            surface = self.word_surface(game, word)
+            yield word, pygame.Rect(pos, surface.get_size()), surface
+
+        yield "input", layout.input_box, game.current_input
+
+        for rect, label, name in ui.buttons(game):
+            yield ("button", name), rect, (label, self.button_color(name, rect, ui))
+
+        if game.game_over:
+            # Full-width strip, the high score line is wider than the panel
+            panel_rect = layout.panel
+            yield "panel", pygame.Rect(0, panel_rect.y, width, panel_rect.height), (
+                game.get_speed(),
+                game.words_typed,
+                game.elapsed_time,
+                game.new_high_score
+            )
+
+        elif ui.current_screen == "settings":
+            yield "settings", pygame.Rect(0, 0, width, height), ui.settings_screen.selected_difficulty
@@ -0,0 +1,300 @@
+# replay.py
+#
+# Compact binary game recordings. A recording holds the seed, difficulty and
+# window size, then one event per keystroke (or restart / difficulty change /
+# window resize) tagged with the simulation step it happened before. Steps
+# are fixed, so playing the events back through GameLogic reproduces the game
+# exactly. Word placement depends on the width of each word in the UI font,
+# so the first measurement of every word is recorded too and the replay uses
+# those widths instead of whatever fonts the replaying machine has.
+#
+#   python main.py --record replays/
+#   python replay.py replays/20261018-193700-hard-1f3a9c07d2e4b580.ttr [--speed 4 | --speed max]
+#
+# Layout: header <4sBQHH (magic, version, seed, width, height), the
+# difficulty as u8 length + ASCII, then events. An event is a varint step
+# delta followed by a varint code: 0 ends the recording (varint words
+# typed follows), 1 is a restart, 2 a difficulty change (u8 length + ASCII),
+# 3 a word width (u8 length + UTF-8 word, varint width), 4 a resize (varint
+# width, varint height), and anything else is a keystroke, ord(char) + KEY_BASE.
+
+import os
+import queue
+import random
+import struct
+import sys
+import threading
+import time
+from headless import HeadlessGame
+from game_logic import STEP_SECONDS
+
+MAGIC = b"TTRP"
+VERSION = 2
+HEADER = struct.Struct("<4sBQHH")
+
+END, RESTART, DIFFICULTY, WIDTH, RESIZE = 0, 1, 2, 3, 4
+KEY_BASE = 5
+
+
+def write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data, pos):
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def write_name(out, name):
+    name = name.encode("utf-8")
+    out.append(len(name))
+    out += name
+
+
+def read_name(data, pos):
+    length = data[pos]
+    return data[pos + 1:pos + 1 + length].decode("utf-8"), pos + 1 + length
+
+
+class Recording:
+    def __init__(self, seed, difficulty, width, height):
+        self.seed = seed
+        self.difficulty = difficulty
+        self.width = width
+        self.height = height
+        self.events = []        # (step, code, value)
+        self.finished = False
+
+    def to_bytes(self):
+        out = bytearray(HEADER.pack(MAGIC, VERSION, self.seed, self.width, self.height))
+        write_name(out, self.difficulty)
+
+        last = 0
+        for step, code, value in self.events:
+            write_varint(out, step - last)
+            write_varint(out, code)
+            if code == END:
+                write_varint(out, value)
+            elif code == DIFFICULTY:
+                write_name(out, value)
+            elif code == WIDTH:
+                write_name(out, value[0])
+                write_varint(out, value[1])
+            elif code == RESIZE:
+                write_varint(out, value[0])
+                write_varint(out, value[1])
+            last = step
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version, seed, width, height = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not a replay file")
+
+        difficulty, pos = read_name(data, HEADER.size)
+        recording = cls(seed, difficulty, width, height)
+
+        step = 0
+        while pos < len(data):
+            delta, pos = read_varint(data, pos)
+            code, pos = read_varint(data, pos)
+            step += delta
+            value = None
+            if code == END:
+                value, pos = read_varint(data, pos)
+                recording.finished = True
+            elif code == DIFFICULTY:
+                value, pos = read_name(data, pos)
+            elif code == WIDTH:
+                text, pos = read_name(data, pos)
+                width, pos = read_varint(data, pos)
+                value = (text, width)
+            elif code == RESIZE:
+                width, pos = read_varint(data, pos)
+                height, pos = read_varint(data, pos)
+                value = (width, height)
+            elif code >= KEY_BASE:
+                value = chr(code - KEY_BASE)
+            recording.events.append((step, code, value))
+        return recording
+
+    def save(self, path):
+        # Written next to the target and renamed, never half a file
+        temp = path + ".tmp"
+        with open(temp, "wb") as f:
+            f.write(self.to_bytes())
+        os.replace(temp, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+class Recorder:
+    # Set as GameLogic.recorder; each game started from scratch gets a fresh
+    # seed and its own file in out_dir. Files are written by a background
+    # thread, so game over never waits on the disk.
+    def __init__(self, out_dir):
+        self.out_dir = out_dir
+        self.recording = None
+        self.measured = set()   # words whose width is in the recording
+        self.seeds = random.SystemRandom()
+
+        self.pending = queue.Queue()
+        self.writer = None      # started with the first save
+
+    def start(self, game):
+        if self.recording is not None:
+            self.recording.events.append((game.steps, RESTART, None))
+            return
+
+        seed = self.seeds.getrandbits(63)
+        game.rng.seed(seed)
+        self.recording = Recording(seed, game.difficulty, game.width, game.height)
+        self.measured.clear()
+
+    def key(self, game, char):
+        if self.recording is not None:
+            self.recording.events.append((game.steps, ord(char) + KEY_BASE, char))
+
+    def difficulty(self, game):
+        if self.recording is not None:
+            self.recording.events.append((game.steps, DIFFICULTY, game.difficulty))
+
+    def width(self, game, text, width):
+        if self.recording is not None and text not in self.measured:
+            self.measured.add(text)
+            self.recording.events.append((game.steps, WIDTH, (text, width)))
+
+    def resize(self, game):
+        if self.recording is not None:
+            self.recording.events.append((game.steps, RESIZE, (game.width, game.height)))
+
+    def finish(self, game):
+        recording = self.recording
+        if recording is None:
+            return
+        self.recording = None
+
+        recording.events.append((game.steps, END, game.words_typed))
+        recording.finished = True
+
+        # The seed keeps games finished within the same second apart
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{recording.difficulty}-{recording.seed:016x}.ttr"
+        if self.writer is None:
+            self.writer = threading.Thread(target=self.write_loop, daemon=True)
+            self.writer.start()
+        self.pending.put((recording, os.path.join(self.out_dir, name)))
+        return recording
+
+    def write_loop(self):
+        while True:
+            item = self.pending.get()
+            if item is None:
+                return
+            recording, path = item
+            os.makedirs(self.out_dir, exist_ok=True)
+            recording.save(path)
+
+    def close(self):
+        # Writes everything still queued
+        if self.writer is not None and self.writer.is_alive():
+            self.pending.put(None)
+            self.writer.join()
+
+
+class RecordedWidths:
+    # Stands in for the game's word renderer during a replay, measuring
+    # words with the widths the recording game saw
+    def __init__(self, recording):
+        self.widths = {
+            value[0]: value[1]
+            for step, code, value in recording.events
+            if code == WIDTH
+        }
+
+    def text_width(self, text):
+        width = self.widths.get(text)
+        if width is None:
+            return len(text) * 14
+        return width
+
+    def prepare(self, word):
+        pass
+
+
+def play(recording, speed=None, max_ticks=10 ** 7):
+    # Runs the recording headless. speed 1 is real time, N is N times
+    # faster, None is as fast as possible. Returns the HeadlessGame.
+    runner = HeadlessGame(
+        seed=recording.seed,
+        difficulty=recording.difficulty,
+        width=recording.width,
+        height=recording.height
+    )
+    game = runner.game
+    game.word_renderer = RecordedWidths(recording)
+    game.rng.seed(recording.seed)
+    game.start()
+
+    started = time.perf_counter()
+    events = iter(recording.events)
+    event = next(events, None)
+    while runner.ticks < max_ticks:
+        while event is not None and event[0] <= game.steps:
+            step, code, value = event
+            if code == END:
+                return runner
+            elif code == RESTART:
+                game.start()
+            elif code == DIFFICULTY:
+                game.set_difficulty(value)
+            elif code == RESIZE:
+                game.resize(*value)
+            elif code >= KEY_BASE:
+                game.handle_typing(value)
+            event = next(events, None)
+
+        if game.game_over or event is None:
+            break
+
+        if speed is not None:
+            ahead = runner.ticks * STEP_SECONDS / speed - (time.perf_counter() - started)
+            if ahead > 0:
+                time.sleep(ahead)
+        runner.step()
+
+    return runner
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    speed = 1.0
+    if "--speed" in args:
+        i = args.index("--speed")
+        speed = None if args[i + 1] == "max" else float(args[i + 1])
+        del args[i:i + 2]
+
+    recording = Recording.load(args[0])
+    started = time.perf_counter()
+    runner = play(recording, speed)
+    elapsed = time.perf_counter() - started
+
+    for key, value in runner.summary().items():
+        print(f"{key}: {value}")
+
+    if recording.finished:
+        expected = recording.events[-1][2]
+        print(f"matches recording: {runner.game.words_typed == expected}")
+    print(f"ticks/sec: {runner.ticks / elapsed:.0f}")
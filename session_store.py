@@ -0,0 +1,209 @@
+# session_store.py
+#
+# Every finished game, in SQLite. WAL mode lets the game read high scores
+# while a background thread writes; writes are queued and committed in
+# batches on that thread, so game over never waits on the disk.
+#
+#   python session_store.py top hard [10]
+#   python session_store.py player NAME [difficulty]
+#   python session_store.py between hard 2026-01-01 2026-02-01
+
+import json
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+
+BATCH_SIZE = 64     # most queued writes committed in one transaction
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    player TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    wpm INTEGER NOT NULL,
+    words INTEGER NOT NULL,
+    seconds REAL NOT NULL,
+    ended_at REAL NOT NULL,
+    accuracy REAL,
+    keys INTEGER NOT NULL DEFAULT 0,
+    inter_key_ms INTEGER,
+    slowest_chars TEXT,
+    hotspots TEXT
+);
+CREATE INDEX IF NOT EXISTS sessions_top ON sessions (difficulty, wpm DESC);
+CREATE INDEX IF NOT EXISTS sessions_date ON sessions (difficulty, ended_at);
+CREATE INDEX IF NOT EXISTS sessions_player ON sessions (player, difficulty, ended_at);
+"""
+
+COLUMNS = (
+    "player", "difficulty", "wpm", "words", "seconds", "ended_at",
+    "accuracy", "keys", "inter_key_ms", "slowest_chars", "hotspots"
+)
+
+# Columns added after the first release, for databases created before them
+ADDED_COLUMNS = {
+    "accuracy": "accuracy REAL",
+    "keys": "keys INTEGER NOT NULL DEFAULT 0",
+    "inter_key_ms": "inter_key_ms INTEGER",
+    "slowest_chars": "slowest_chars TEXT",     # JSON [[char, ms], ...]
+    "hotspots": "hotspots TEXT",               # JSON [[char, misses], ...]
+}
+
+
+def connect(path):
+    db = sqlite3.connect(path, check_same_thread=False)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=FULL")     # committed sessions survive a crash
+    return db
+
+
+class SessionStore:
+    def __init__(self, path):
+        self.path = path
+        self.db = connect(path)     # reads, on the caller's thread
+        with self.db:
+            self.db.executescript(SCHEMA)
+            existing = {row[1] for row in self.db.execute("PRAGMA table_info(sessions)")}
+            for name, definition in ADDED_COLUMNS.items():
+                if name not in existing:
+                    self.db.execute(f"ALTER TABLE sessions ADD COLUMN {definition}")
+
+        self.pending = queue.Queue()
+        self.writer = threading.Thread(target=self.write_loop, daemon=True)
+        self.writer.start()
+
+    # ---------------- WRITES -----------------
+
+    def record(self, player, difficulty, wpm, words, seconds, ended_at=None, accuracy=None, keys=0,
+               inter_key_ms=None, slowest_chars=None, hotspots=None):
+        if ended_at is None:
+            ended_at = time.time()
+        self.pending.put((
+            player, difficulty, int(wpm), int(words), float(seconds), ended_at, accuracy, int(keys),
+            inter_key_ms,
+            json.dumps(slowest_chars) if slowest_chars else None,
+            json.dumps(hotspots) if hotspots else None
+        ))
+
+    def write_loop(self):
+        db = connect(self.path)
+        while True:
+            rows = [self.pending.get()]
+            while len(rows) < BATCH_SIZE:
+                try:
+                    rows.append(self.pending.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = None in rows
+            rows = [row for row in rows if row is not None]
+            if rows:
+                with db:
+                    db.executemany(
+                        f"INSERT INTO sessions ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                        rows
+                    )
+            if stop:
+                db.close()
+                return
+
+    def close(self):
+        # Commits everything still queued
+        if self.writer.is_alive():
+            self.pending.put(None)
+            self.writer.join()
+
+    def import_legacy(self, path):
+        # One row per difficulty from the old highscore.json, first run
+        # only. Returns the imported scores, the rows are still queued.
+        if not os.path.exists(path) or self.count():
+            return {}
+        try:
+            with open(path, "r") as f:
+                high_scores = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        ended_at = os.path.getmtime(path)
+        for difficulty, wpm in high_scores.items():
+            if wpm:
+                self.record("legacy", difficulty, wpm, 0, 0, ended_at)
+        return high_scores
+
+    # ---------------- QUERIES -----------------
+
+    def rows(self, sql, args=()):
+        rows = [dict(zip(COLUMNS, row)) for row in self.db.execute(sql, args)]
+        for row in rows:
+            for name in ("slowest_chars", "hotspots"):
+                row[name] = json.loads(row[name]) if row[name] else []
+        return rows
+
+    def count(self):
+        return self.db.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def high_scores(self):
+        return dict(self.db.execute(
+            "SELECT difficulty, MAX(wpm) FROM sessions GROUP BY difficulty"
+        ))
+
+    def top(self, difficulty, k=10):
+        return self.rows(
+            f"SELECT {', '.join(COLUMNS)} FROM sessions WHERE difficulty = ? "
+            "ORDER BY wpm DESC LIMIT ?",
+            (difficulty, k)
+        )
+
+    def player(self, player, difficulty=None, limit=100):
+        if difficulty is None:
+            return self.rows(
+                f"SELECT {', '.join(COLUMNS)} FROM sessions WHERE player = ? "
+                "ORDER BY ended_at DESC LIMIT ?",
+                (player, limit)
+            )
+        return self.rows(
+            f"SELECT {', '.join(COLUMNS)} FROM sessions WHERE player = ? AND difficulty = ? "
+            "ORDER BY ended_at DESC LIMIT ?",
+            (player, difficulty, limit)
+        )
+
+    def between(self, difficulty, start, end):
+        # Sessions that ended in [start, end), unix seconds
+        return self.rows(
+            f"SELECT {', '.join(COLUMNS)} FROM sessions WHERE difficulty = ? "
+            "AND ended_at >= ? AND ended_at < ? ORDER BY ended_at",
+            (difficulty, start, end)
+        )
+
+
+if __name__ == "__main__":
+    from utils import user_data_path
+
+    args = sys.argv[1:]
+    store = SessionStore(user_data_path("sessions.db"))
+
+    if args[:1] == ["top"]:
+        results = store.top(args[1], int(args[2]) if len(args) > 2 else 10)
+    elif args[:1] == ["player"]:
+        results = store.player(args[1], args[2] if len(args) > 2 else None)
+    elif args[:1] == ["between"]:
+        start, end = (datetime.fromisoformat(a).timestamp() for a in args[2:4])
+        results = store.between(args[1], start, end)
+    else:
+        print("usage: session_store.py top|player|between ...")
+        sys.exit(2)
+
+    for row in results:
+        ended = datetime.fromtimestamp(row["ended_at"]).strftime("%Y-%m-%d %H:%M")
+        accuracy = f"{row['accuracy']:.0%}" if row["accuracy"] is not None else "-"
+        gap = f"{row['inter_key_ms']} ms" if row["inter_key_ms"] is not None else "-"
+        misses = " ".join(char for char, _ in row["hotspots"]) or "-"
+        print(
+            f"{ended}  {row['player']:<16} {row['difficulty']:<7} {row['wpm']:>4} WPM  {row['words']:>4} words"
+            f"  {accuracy:>4}  {gap:>7}/key  misses {misses}"
+        )
+    store.close()
@@ -1,6 +1,8 @@
-DIFFICULTIES = ["Easy", "Medium", "Hard"]
+DIFFICULTIES = ["Easy", "Medium", "Hard", "Stress"]
 
 import pygame
+from text_cache import render_text
+from fonts import get_font
 
 class SettingsScreen:
     def __init__(self, width, height):
@@ -10,12 +12,19 @@ class SettingsScreen:
         self.bg_color = (0, 0, 0)
         self.text_color = (255, 255, 255)
 
-        self.font_title = pygame.font.SysFont("arial", 32, bold=True)
-        self.font_hint = pygame.font.SysFont("arial", 18)
+        self.font_title = get_font(32, bold=True)
+        self.font_hint = get_font(18)
 
         # Difficulty
         self.selected_difficulty = "Easy"   #default
 
+        self.layout()
+
+    def layout(self):
+        # Positions for the current size, computed here instead of per frame
+        self.title_pos = (self.width // 2, 80)
+        self.label_pos = (self.width // 2, 140)
+
         self.diff_buttons = {}
         start_y = 180
         for i, diff in enumerate(DIFFICULTIES):
@@ -33,15 +42,15 @@ class SettingsScreen:
         screen.fill(self.bg_color)
 
         # Title
-        title = self.font_title.render("Settings", True, self.text_color)
+        title = render_text(self.font_title, "Settings", self.text_color)
         screen.blit(
             title,
-            title.get_rect(center=(self.width // 2, 80))
+            title.get_rect(center=self.title_pos)
         )
 
         # Difficulty ui
-        label = self.font_hint.render("Select Difficulty", True, (200, 200, 200))
-        screen.blit(label, label.get_rect(center=(self.width // 2, 140)))
+        label = render_text(self.font_hint, "Select Difficulty", (200, 200, 200))
+        screen.blit(label, label.get_rect(center=self.label_pos))
 
         for diff, rect in self.diff_buttons.items():
             if diff == self.selected_difficulty:
@@ -51,12 +60,12 @@ class SettingsScreen:
             
             pygame.draw.rect(screen, color, rect, border_radius=8)
 
-            text = self.font_hint.render(diff, True, (255, 255, 255))
+            text = render_text(self.font_hint, diff, (255, 255, 255))
             screen.blit(text, text.get_rect(center=rect.center))
 
         # Back button
         pygame.draw.rect(screen, (60, 60, 60), self.back_rect, border_radius=6)
-        back_text = self.font_hint.render("Back", True, self.text_color)
+        back_text = render_text(self.font_hint, "Back", self.text_color)
         screen.blit(
             back_text,
             back_text.get_rect(center=self.back_rect.center)
@@ -78,8 +87,4 @@ class SettingsScreen:
         self.width = width
         self.height = height
 
-        # Recalculate difficulty buttons
-        start_y = self.height // 2 - 60
-        for i, diff in enumerate(self.diff_buttons):
-            self.diff_buttons[diff].x = self.width // 2 - 90
-            self.diff_buttons[diff].y = start_y + i * 60
+        self.layout()
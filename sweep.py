@@ -0,0 +1,189 @@
+# sweep.py
+#
+# Checks DIFFICULTY_SETTINGS against simulated typists. Every grid point
+# (fall_speed x spawn_interval) is played by every typist profile over a
+# number of seeds, headless and spread over all cores, and the table shows
+# how long each typist survives and what WPM they reach.
+#
+#   python sweep.py [--games 20] [--fall 1.5,2.5,3.5] [--spawn 2.5,1.8,1.2]
+#                   [--typists 30:0.03:0.6,60:0.02:0.4,90:0.01:0.3]
+#                   [--minutes 5] [--workers N] [--csv out.csv]
+#
+# A typist is wpm:error_rate:reaction_seconds. The default grid is built
+# from the fall speeds and spawn intervals of the playable difficulties.
+
+import csv
+import os
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from headless import HeadlessGame
+from game_logic import DIFFICULTY_SETTINGS, STEP_SECONDS
+
+PLAYABLE = ["easy", "medium", "hard"]
+TYPISTS = [(30, 0.03, 0.6), (60, 0.02, 0.4), (90, 0.01, 0.3)]
+GAMES = 20
+MINUTES = 5         # a game that lasts this long counts as survived
+KEY_JITTER = 0.2    # spread of the time between keys, as a fraction
+
+
+class Typist:
+    # Types the lowest word. Keys come every 12 / wpm seconds (five chars
+    # per word) with some jitter, each key is wrong with error_rate, and a
+    # new target or a rejected key costs reaction seconds before typing.
+    def __init__(self, wpm, error_rate, reaction, rng):
+        self.interval = 12 / wpm
+        self.error_rate = error_rate
+        self.reaction = reaction
+        self.rng = rng
+
+        self.target = None
+        self.next_key = 0.0
+
+    def act(self, game, now):
+        if self.target is not None and self.target not in game.words:
+            self.target = None      # typed or landed
+
+        if self.target is None:
+            if not len(game.words):
+                return
+            self.target = max(game.words, key=lambda w: w.y)
+            self.next_key = now + self.reaction
+
+        while now >= self.next_key:
+            # The input may match another word that shares the target's
+            # prefix, only input that does not lead to the target is erased
+            typed = game.current_input
+            if not self.target.text.startswith(typed):
+                char = "\b"
+            else:
+                char = self.target.text[len(typed)]
+                if self.rng.random() < self.error_rate:
+                    char = self.rng.choice("qxzjv")
+
+            accepted = game.handle_typing(char)
+            self.next_key += self.interval * self.rng.uniform(1 - KEY_JITTER, 1 + KEY_JITTER)
+
+            if self.target not in game.words:
+                self.target = None      # done, react to the next word
+                return
+            if not accepted and char != "\b":
+                self.next_key = now + self.reaction     # noticed the typo
+
+
+def play(task):
+    # One game, returns (grid point, typist, seconds survived, wpm)
+    fall_speed, spawn_interval, typist, seed, minutes = task
+    runner = HeadlessGame(seed=seed, difficulty="easy")
+    game = runner.game
+    runner.start()
+    game.word_speed = fall_speed
+    game.spawn_interval = spawn_interval
+
+    model = Typist(*typist, rng=random.Random(seed))
+    max_ticks = max(1, int(minutes * 60 / STEP_SECONDS))     # at least one step to rate
+    while runner.ticks < max_ticks and not game.game_over:
+        model.act(game, runner.ticks * STEP_SECONDS)
+        runner.step()
+
+    seconds = runner.ticks * STEP_SECONDS
+    return (fall_speed, spawn_interval), typist, seconds, game.words_typed * 60 / seconds
+
+
+def default_grid():
+    falls = sorted({DIFFICULTY_SETTINGS[d]["fall_speed"] for d in PLAYABLE})
+    spawns = sorted({DIFFICULTY_SETTINGS[d]["spawn_interval"] for d in PLAYABLE}, reverse=True)
+    return falls, spawns
+
+
+def sweep(falls, spawns, typists, games, minutes=MINUTES, workers=None):
+    if minutes <= 0:
+        raise ValueError("minutes must be greater than 0")
+
+    tasks = [
+        (fall, spawn, typist, seed, minutes)
+        for fall in falls
+        for spawn in spawns
+        for typist in typists
+        for seed in range(games)
+    ]
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunk = max(1, len(tasks) // ((workers or os.cpu_count() or 1) * 8))
+        for point, typist, seconds, wpm in pool.map(play, tasks, chunksize=chunk):
+            results.setdefault((point, typist), []).append((seconds, wpm))
+    return results
+
+
+def table(results, minutes=MINUTES):
+    rows = []
+    for (point, typist), games in sorted(results.items()):
+        seconds = [s for s, _ in games]
+        wpms = [w for _, w in games]
+        rows.append({
+            "fall_speed": point[0],
+            "spawn_interval": point[1],
+            "typist": f"{typist[0]}wpm/{typist[1]:.0%}/{typist[2]}s",
+            "games": len(games),
+            "survival_median_s": round(statistics.median(seconds), 1),
+            "survival_min_s": round(min(seconds), 1),
+            "survived": round(sum(s >= minutes * 60 for s in seconds) / len(seconds), 2),
+            "wpm_mean": round(statistics.mean(wpms), 1),
+        })
+    return rows
+
+
+def print_table(rows):
+    print(f"{'fall':>5} {'spawn':>6}  {'typist':<18} {'games':>5} {'median s':>9} {'min s':>7} {'survived':>9} {'wpm':>6}")
+    for row in rows:
+        print(
+            f"{row['fall_speed']:>5} {row['spawn_interval']:>6}  {row['typist']:<18} {row['games']:>5}"
+            f" {row['survival_median_s']:>9} {row['survival_min_s']:>7} {row['survived']:>9.0%} {row['wpm_mean']:>6}"
+        )
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+
+    def option(name, default):
+        if name in args:
+            return args[args.index(name) + 1]
+        return default
+
+    falls, spawns = default_grid()
+    if "--fall" in args:
+        falls = [float(v) for v in option("--fall", "").split(",")]
+    if "--spawn" in args:
+        spawns = [float(v) for v in option("--spawn", "").split(",")]
+
+    typists = TYPISTS
+    if "--typists" in args:
+        typists = [
+            (float(wpm), float(error), float(reaction))
+            for wpm, error, reaction in (t.split(":") for t in option("--typists", "").split(","))
+        ]
+
+    minutes = float(option("--minutes", MINUTES))
+    games = int(option("--games", GAMES))
+    workers = int(option("--workers", 0)) or None
+    if minutes <= 0 or games <= 0:
+        print("sweep.py: --minutes and --games must be greater than 0")
+        sys.exit(2)
+
+    started = time.perf_counter()
+    rows = table(sweep(falls, spawns, typists, games, minutes, workers), minutes)
+    elapsed = time.perf_counter() - started
+
+    print_table(rows)
+    print(f"{len(falls) * len(spawns) * len(typists) * games} games in {elapsed:.1f} s")
+
+    out = option("--csv", None)
+    if out:
+        with open(out, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
@@ -0,0 +1,49 @@
+import random
+from placement import PlacementAllocator
+
+GAP = 60
+LEFT, RIGHT = 40, 760
+
+
+def test_allocations_stay_clear_of_every_span():
+    rng = random.Random(0)
+    placement = PlacementAllocator(GAP, random.Random(1))
+    owners = {}     # owner -> (x, width)
+
+    for step in range(5000):
+        if owners and rng.random() < 0.4:
+            owner = rng.choice(list(owners))
+            del owners[owner]
+            placement.release(owner)
+            continue
+
+        width = rng.randint(14, 200)
+        x = placement.allocate(width, LEFT, RIGHT)
+        fits = [
+            start for start in range(LEFT, RIGHT - width + 1)
+            if all(start + width + GAP <= x0 or x0 + w0 + GAP <= start for x0, w0 in owners.values())
+        ]
+        if x is None:
+            assert not fits
+            continue
+
+        assert x in fits
+        owner = object()
+        owners[owner] = (x, width)
+        placement.occupy(owner, x, width)
+        assert len(placement.spans) == len(owners)
+
+
+def test_release_and_clear():
+    placement = PlacementAllocator(GAP, random.Random(0))
+    a, b = object(), object()
+    placement.occupy(a, 100, 50)
+    placement.occupy(b, 300, 50)
+
+    placement.release(a)
+    placement.release(a)    # twice is harmless
+    assert [span[:2] for span in placement.spans] == [(300, 350)]
+
+    placement.clear()
+    assert placement.allocate(50, LEFT, RIGHT) is not None
+    assert placement.spans == []
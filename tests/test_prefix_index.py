@@ -0,0 +1,53 @@
+import random
+from prefix_index import PrefixIndex
+from word_store import ListWordStore
+
+TEXTS = ["a", "ab", "abc", "abd", "b", "ba", "bad", "word", "words", "window"]
+
+
+def scan_top(words, prefix):
+    # The linear scan the trie replaced
+    matching = [w for w in words if w.text.startswith(prefix)]
+    return min(matching, key=lambda w: w.y) if matching else None
+
+
+def test_top_matches_linear_scan():
+    rng = random.Random(0)
+    words = ListWordStore()
+    index = PrefixIndex()
+
+    for _ in range(5000):
+        action = rng.random()
+        if action < 0.3 or not words:
+            word = words.add(rng.choice(TEXTS), 0, rng.choice([70, 70, 100, 300]))
+            word.speed = rng.choice([0.5, 1, 2])
+            index.add(word)
+        elif action < 0.45:
+            word = rng.choice(list(words))
+            words.remove(word)
+            index.remove(word)
+        elif action < 0.6:
+            words.move(1.5, 10 ** 9)
+        elif action < 0.7:
+            index.pop()
+        elif action < 0.8:
+            index.reset()
+        else:
+            index.push(rng.choice("abdnorsw"))
+
+        assert index.top() is scan_top(words, index.prefix)
+
+
+def test_newer_faster_word_is_not_top():
+    words = ListWordStore()
+    index = PrefixIndex()
+    older = words.add("window", 0, 70)
+    older.speed = 0.5
+    newer = words.add("words", 0, 70)
+    newer.speed = 2     # spawned later but already below the older word
+    index.add(older)
+    index.add(newer)
+
+    words.move(1, 10 ** 9)
+    index.push("w")
+    assert index.top() is older
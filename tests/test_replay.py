@@ -0,0 +1,45 @@
+import random
+import pygame
+from fonts import get_font
+from glyph_atlas import GlyphAtlas, WordRenderer
+from headless import HeadlessGame
+from replay import Recorder, Recording, play
+
+
+def record_game(out_dir, difficulty):
+    # Plays a game with the UI's word renderer attached, typing the lowest
+    # word with the odd typo and resizing the window halfway through
+    pygame.font.init()
+    runner = HeadlessGame(seed=0, difficulty=difficulty)
+    game = runner.game
+    game.word_renderer = WordRenderer(GlyphAtlas(), get_font(24), (60, 60, 60), (0, 200, 0))
+    recorder = game.recorder = Recorder(str(out_dir))
+    typist = random.Random(1)
+
+    runner.start()
+    recording = recorder.recording
+    while not game.game_over and runner.ticks < 20000:
+        if runner.ticks == 400:
+            game.resize(560, 520)
+        if len(game.words) and typist.random() < 0.3:
+            target = max(game.words, key=lambda w: w.y)
+            typed = game.current_input if game.active_word is target else ""
+            char = target.text[len(typed)] if typist.random() > 0.05 else "q"
+            game.handle_typing(char)
+        runner.step()
+
+    if not game.game_over:
+        recorder.finish(game)
+    recorder.close()
+    return runner, recording
+
+
+def test_replay_matches_game_with_word_renderer(tmp_path):
+    for difficulty in ("easy", "medium"):
+        runner, recording = record_game(tmp_path, difficulty)
+        loaded = Recording.from_bytes(recording.to_bytes())
+
+        replayed = play(loaded)
+        assert replayed.game.steps == runner.game.steps
+        assert replayed.game.words_typed == runner.game.words_typed
+        assert [(w.text, w.x) for w in replayed.game.words] == [(w.text, w.x) for w in runner.game.words]
@@ -0,0 +1,39 @@
+import random
+import pytest
+from headless import HeadlessGame
+from game_logic import STEP_SECONDS
+from sweep import Typist, play
+
+
+@pytest.mark.parametrize("difficulty", ["easy", "medium", "hard"])
+def test_typist_without_errors_never_gets_a_key_rejected(difficulty):
+    for seed in range(20):
+        runner = HeadlessGame(seed=seed, difficulty=difficulty)
+        game = runner.game
+        rejected = []
+
+        handle_typing = game.handle_typing
+
+        def typed(char):
+            accepted = handle_typing(char)
+            if not accepted and char != "\b":
+                rejected.append((runner.ticks, char, game.current_input))
+            return accepted
+
+        game.handle_typing = typed
+        typist = Typist(90, 0.0, 0.3, random.Random(seed))
+
+        runner.start()
+        while runner.ticks < 3000 and not game.game_over:
+            typist.act(game, runner.ticks * STEP_SECONDS)
+            runner.step()
+
+        assert rejected == []
+        assert game.words_typed > 0
+
+
+def test_fast_typist_survives_hard():
+    # Hard, seed 0: the old model read a newer word with the same first
+    # letter as its own typo and lost the game at 35 s
+    point, typist, seconds, wpm = play((3.5, 1.2, (90, 0.0, 0.3), 0, 1))
+    assert seconds == 60
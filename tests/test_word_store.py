@@ -0,0 +1,50 @@
+import random
+import pytest
+from word_store import ArrayWordStore, ListWordStore, np
+
+pytestmark = pytest.mark.skipif(np is None, reason="ArrayWordStore needs numpy")
+
+
+def state(store, alpha):
+    return [(w.text, w.x, round(w.y, 6)) for w in store], [tuple(p) for p in store.positions(alpha)]
+
+
+def test_array_store_matches_list_store():
+    rng = random.Random(0)
+    array = ArrayWordStore(capacity=4)     # grows and rebases its slot table
+    plain = ListWordStore()
+
+    for step in range(5000):
+        action = rng.random()
+        if action < 0.5 or not len(plain):
+            text, x, y = f"w{step}", rng.randint(0, 700), rng.uniform(70, 300)
+            speed = rng.choice([0.5, 1, 2])
+            array.add(text, x, y).speed = speed
+            plain.add(text, x, y).speed = speed
+        elif action < 0.8:
+            picks = rng.sample(range(len(plain)), rng.randint(1, min(6, len(plain))))
+            array.remove_many([array[i] for i in picks])
+            plain.remove_many([plain[i] for i in picks])
+        elif action < 0.85:
+            i = rng.randrange(len(plain))
+            array.remove(array[i])
+            plain.remove(plain[i])
+        else:
+            landed_array = array.move(1.5, 400)
+            landed_plain = plain.move(1.5, 400)
+            assert [w.text for w in landed_array] == [w.text for w in landed_plain]
+
+        alpha = rng.random()
+        assert state(array, alpha) == state(plain, alpha)
+
+
+def test_removed_word_keeps_its_position():
+    store = ArrayWordStore()
+    first = store.add("first", 10, 70)
+    store.add("second", 20, 80)
+    store.move(2, 400)
+
+    store.remove_many([first])
+    store.move(2, 400)
+    assert (first.x, first.y) == (10, 72)
+    assert [(w.text, w.y) for w in store] == [("second", 84)]
@@ -0,0 +1,110 @@
+# typing_stats.py
+#
+# Streaming typing statistics, fed one keystroke at a time by
+# GameLogic.handle_typing. Every update is O(1) and memory is bounded by the
+# window length and the alphabet, snapshots never walk the key history.
+
+from collections import Counter
+
+WINDOW_SECONDS = 30     # rolling WPM window, in one second buckets
+MAX_GAP = 2.0           # longer pauses are not counted as inter-key latency
+TOP_CHARS = 3
+
+
+class TypingStats:
+    def __init__(self, window=WINDOW_SECONDS):
+        self.window = window
+        self.reset(0.0)
+
+    def reset(self, now):
+        self.started = now
+        self.buckets = [0] * self.window    # words completed per second
+        self.bucket_second = int(now)       # second the newest bucket holds
+        self.rolling_words = 0
+
+        self.keys = 0           # non-backspace keystrokes
+        self.errors = 0
+        self.backspaces = 0
+        self.last_key = None
+
+        self.latency = {}       # char -> [count, total seconds]
+        self.hotspots = Counter()   # expected char -> misses
+
+    def advance(self, now):
+        # Clear buckets for the seconds that passed since the last update
+        second = int(now)
+        passed = min(second - self.bucket_second, self.window)
+        for i in range(1, passed + 1):
+            slot = (self.bucket_second + i) % self.window
+            self.rolling_words -= self.buckets[slot]
+            self.buckets[slot] = 0
+        self.bucket_second = max(second, self.bucket_second)
+
+    def key(self, now, char, expected, matched, completed):
+        # expected: the char the active word wanted next, None without one
+        self.advance(now)
+
+        if self.last_key is not None and now - self.last_key <= MAX_GAP:
+            entry = self.latency.get(char)
+            if entry is None:
+                entry = self.latency[char] = [0, 0.0]
+            entry[0] += 1
+            entry[1] += now - self.last_key
+        self.last_key = now
+
+        if char == "\b":
+            self.backspaces += 1
+            return
+
+        self.keys += 1
+        if not matched:
+            self.errors += 1
+            self.hotspots[expected if expected is not None else char] += 1
+
+        if completed:
+            self.buckets[self.bucket_second % self.window] += 1
+            self.rolling_words += 1
+
+    # ---------------- SNAPSHOTS -----------------
+
+    def rolling_wpm(self, now):
+        self.advance(now)
+        seconds = min(now - self.started, self.window)
+        if seconds < 1:
+            return 0
+        return int(self.rolling_words * 60 / seconds)
+
+    def accuracy(self):
+        # None until a key was pressed, stored as NULL and shown as "-"
+        if not self.keys:
+            return None
+        return (self.keys - self.errors) / self.keys
+
+    def slowest_chars(self, n=TOP_CHARS):
+        means = [
+            (total / count, char)
+            for char, (count, total) in self.latency.items()
+            if char != "\b"
+        ]
+        means.sort(reverse=True)
+        return [(char, round(mean * 1000)) for mean, char in means[:n]]
+
+    def inter_key_ms(self):
+        # Mean time between keys, None before the second key
+        count = sum(entry[0] for entry in self.latency.values())
+        if not count:
+            return None
+        return round(sum(entry[1] for entry in self.latency.values()) / count * 1000)
+
+    def snapshot(self, now):
+        # Everything a finished game keeps, see GameLogic.record_session
+        return {
+            "rolling_wpm": self.rolling_wpm(now),
+            "accuracy": round(self.accuracy(), 3) if self.keys else None,
+            "keys": self.keys,
+            "errors": self.errors,
+            "backspaces": self.backspaces,
+            "inter_key_ms": self.inter_key_ms(),
+            "slowest_chars": self.slowest_chars(),
+            "hotspots": self.hotspots.most_common(TOP_CHARS),
+        }
@@ -0,0 +1,32 @@
+from settings import SettingsScreen
+from layout import Layout
+
+
+class UiState:
+    # Window layout and pointer state shared with the renderer
+    def __init__(self, width, height):
+        self.current_screen = "game"
+        self.settings_screen = SettingsScreen(width, height)
+        self.pressed_button = None
+        self.mouse_pos = (0, 0)
+
+        self.resize(width, height)
+
+    def resize(self, width, height):
+        self.width = width
+        self.height = height
+        self.settings_screen.resize(width, height)
+
+        self.layout = Layout(width, height)
+        self.settings_rect = self.layout.settings_rect
+        self.start_button = self.layout.start_button
+        self.pause_button = self.layout.pause_button
+        self.reset_button = self.layout.reset_button
+
+    def buttons(self, game):
+        pause_label = "Resume" if game.paused else "Pause"
+        return [
+            (self.start_button, "Start", "start"),
+            (self.pause_button, pause_label, "Pause"),
+            (self.reset_button, "Reset", "reset"),
+        ]
@@ -8,3 +8,10 @@ def resource_path(relative_path):
         base_path = os.path.abspath(".")
     
     return os.path.join(base_path, relative_path)
+
+def user_data_path(filename):
+    return os.path.join(os.path.expanduser("~"), ".type_in_time", filename)
+
+def ensure_data_dir():
+    path = os.path.join(os.path.expanduser("~"), ".type_in_time")
+    os.makedirs(path, exist_ok=True)
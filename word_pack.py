@@ -0,0 +1,147 @@
+# word_pack.py
+#
+# Compact on-disk word list, memory-mapped and read lazily so a pack with
+# millions of words costs no more to open than one with thirty.
+#
+# Layout (little-endian):
+#   header        magic, version, counts and section offsets
+#   offsets       (count + 1) x u32, byte offset of each word in the blob
+#   by_length     count x u32, word ids grouped by length
+#   by_letter     count x u32, word ids grouped by first letter
+#   buckets       (key, start, size) x u32 for every length, then every letter
+#   blob          UTF-8 words back to back
+
+import mmap
+import struct
+import sys
+
+MAGIC = b"WRPK"
+VERSION = 1
+
+HEADER = struct.Struct("<4sHHIIIIIIII")
+BUCKET = struct.Struct("<III")
+
+
+class WordPack:
+    # Same interface as word_sampler.WordIndex, backed by the mmap
+    def __init__(self, path):
+        if sys.byteorder != "little":
+            raise ValueError("Word packs are only supported on little-endian machines")
+
+        with open(path, "rb") as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (
+            magic, version, _,
+            self.count, n_lengths, n_letters,
+            offsets_pos, by_length_pos, by_letter_pos, buckets_pos, self.blob_pos
+        ) = HEADER.unpack_from(self.mm, 0)
+
+        if magic != MAGIC:
+            raise ValueError(f"Not a word pack: {path}")
+        if version != VERSION:
+            raise ValueError(f"Unsupported word pack version: {version}")
+        if self.count == 0:
+            raise ValueError(f"Word pack has no words: {path}")
+
+        view = memoryview(self.mm)
+        self.offsets = view[offsets_pos:offsets_pos + (self.count + 1) * 4].cast("I")
+        self.by_length = view[by_length_pos:by_length_pos + self.count * 4].cast("I")
+        self.by_letter = view[by_letter_pos:by_letter_pos + self.count * 4].cast("I")
+
+        # Bucket tables only hold one entry per distinct length / letter
+        self.length_buckets = {}
+        self.letter_buckets = {}
+        pos = buckets_pos
+        for i in range(n_lengths + n_letters):
+            key, start, size = BUCKET.unpack_from(self.mm, pos)
+            pos += BUCKET.size
+            if i < n_lengths:
+                self.length_buckets[key] = (start, size)
+            else:
+                self.letter_buckets[chr(key)] = (start, size)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        start = self.blob_pos + self.offsets[i]
+        end = self.blob_pos + self.offsets[i + 1]
+        return self.mm[start:end].decode("utf-8")
+
+    def length_bucket(self, length):
+        start, size = self.length_buckets.get(length, (0, 0))
+        return self.by_length[start:start + size]
+
+    def letter_bucket(self, letter):
+        start, size = self.letter_buckets.get(letter, (0, 0))
+        return self.by_letter[start:start + size]
+
+    def letters(self):
+        return [(letter, size) for letter, (_, size) in self.letter_buckets.items()]
+
+    def close(self):
+        for view in (self.offsets, self.by_length, self.by_letter):
+            view.release()
+        self.mm.close()
+
+
+def build_pack(words, path):
+    # Unique, non-empty words in their original order
+    words = list(dict.fromkeys(w.strip() for w in words if w.strip()))
+    if not words:
+        raise ValueError("No words to pack")
+    encoded = [w.encode("utf-8") for w in words]
+
+    offsets = [0]
+    for data in encoded:
+        offsets.append(offsets[-1] + len(data))
+
+    by_length = sorted(range(len(words)), key=lambda i: len(words[i]))
+    by_letter = sorted(range(len(words)), key=lambda i: words[i][0])
+
+    def buckets(ids, key):
+        table = []
+        for pos, i in enumerate(ids):
+            k = key(words[i])
+            if not table or table[-1][0] != k:
+                table.append([k, pos, 0])
+            table[-1][2] += 1
+        return table
+
+    length_table = buckets(by_length, len)
+    letter_table = buckets(by_letter, lambda w: ord(w[0]))
+
+    offsets_pos = HEADER.size
+    by_length_pos = offsets_pos + len(offsets) * 4
+    by_letter_pos = by_length_pos + len(words) * 4
+    buckets_pos = by_letter_pos + len(words) * 4
+    blob_pos = buckets_pos + (len(length_table) + len(letter_table)) * BUCKET.size
+
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(
+            MAGIC, VERSION, 0,
+            len(words), len(length_table), len(letter_table),
+            offsets_pos, by_length_pos, by_letter_pos, buckets_pos, blob_pos
+        ))
+        f.write(struct.pack(f"<{len(offsets)}I", *offsets))
+        f.write(struct.pack(f"<{len(words)}I", *by_length))
+        f.write(struct.pack(f"<{len(words)}I", *by_letter))
+        for entry in length_table + letter_table:
+            f.write(BUCKET.pack(*entry))
+        for data in encoded:
+            f.write(data)
+
+    return len(words)
+
+
+if __name__ == "__main__":
+    # python word_pack.py words.txt words.wpk
+    if len(sys.argv) != 3:
+        print("usage: python word_pack.py <words.txt> <output.wpk>")
+        sys.exit(1)
+
+    with open(sys.argv[1], encoding="utf-8") as f:
+        count = build_pack(f, sys.argv[2])
+
+    print(f"Packed {count} words into {sys.argv[2]}")
@@ -0,0 +1,142 @@
+import random
+
+MAX_REJECTIONS = 32
+
+
+class WordIndex:
+    # Word list with prebuilt length and first-letter buckets of word ids
+    def __init__(self, words):
+        self.words = list(words)
+        self.by_length = {}
+        self.by_letter = {}
+
+        for i, word in enumerate(self.words):
+            self.by_length.setdefault(len(word), []).append(i)
+            self.by_letter.setdefault(word[:1], []).append(i)
+
+    def __len__(self):
+        return len(self.words)
+
+    def __getitem__(self, i):
+        return self.words[i]
+
+    def length_bucket(self, length):
+        return self.by_length.get(length, ())
+
+    def letter_bucket(self, letter):
+        return self.by_letter.get(letter, ())
+
+    def letters(self):
+        return [(letter, len(ids)) for letter, ids in self.by_letter.items()]
+
+
+class WordSampler:
+    # Samples words from a shared WordIndex while excluding the words that
+    # are currently on screen. Exclusions are a set checked by rejection, so
+    # a sample is O(1) expected as long as the pool is not nearly exhausted.
+    def __init__(self, index, rng=None):
+        self.index = index
+        self.rng = rng if rng is not None else random
+
+        self.on_screen = {}         # text -> count
+        self.first_letters = {}     # first letter -> count
+
+    def reserve(self, text):
+        self.on_screen[text] = self.on_screen.get(text, 0) + 1
+        letter = text[:1]
+        self.first_letters[letter] = self.first_letters.get(letter, 0) + 1
+
+    def release(self, text):
+        count = self.on_screen.get(text, 0)
+        if count <= 1:
+            self.on_screen.pop(text, None)
+        else:
+            self.on_screen[text] = count - 1
+
+        letter = text[:1]
+        count = self.first_letters.get(letter, 0)
+        if count <= 1:
+            self.first_letters.pop(letter, None)
+        else:
+            self.first_letters[letter] = count - 1
+
+    def release_all(self):
+        self.on_screen.clear()
+        self.first_letters.clear()
+
+    def sample_any(self):
+        return self.index[self.rng.randrange(len(self.index))]
+
+    def sample(self, length=None, first=None, avoid_prefixes=False, exclude=()):
+        # Random word not on screen (nor in exclude), optionally of a given
+        # length, starting with a given letter, or sharing no prefix with any
+        # on-screen word. Returns None when nothing qualifies.
+        if avoid_prefixes:
+            if first is not None and first in self.first_letters:
+                return None
+            if first is None and length is None:
+                first = self.pick_free_letter()
+                if first is None:
+                    return None
+
+        if first is not None and length is not None:
+            pool = self.index.letter_bucket(first)
+            if len(self.index.length_bucket(length)) < len(pool):
+                pool = self.index.length_bucket(length)
+        elif first is not None:
+            pool = self.index.letter_bucket(first)
+        elif length is not None:
+            pool = self.index.length_bucket(length)
+        else:
+            pool = None     # whole index
+
+        index = self.index
+        on_screen = self.on_screen
+        first_letters = self.first_letters
+
+        def accept(i):
+            text = index[i]
+            return (
+                text not in on_screen and
+                text not in exclude and
+                (length is None or len(text) == length) and
+                (first is None or text[:1] == first) and
+                not (avoid_prefixes and text[:1] in first_letters)
+            )
+
+        size = len(index) if pool is None else len(pool)
+        if size == 0:
+            return None
+
+        for _ in range(MAX_REJECTIONS):
+            i = self.rng.randrange(size)
+            if pool is not None:
+                i = pool[i]
+            if accept(i):
+                return index[i]
+
+        # Pool is nearly exhausted, fall back to one linear pass
+        ids = range(size) if pool is None else pool
+        candidates = [i for i in ids if accept(i)]
+        if not candidates:
+            return None
+
+        return index[self.rng.choice(candidates)]
+
+    def pick_free_letter(self):
+        # First letter not used on screen, weighted by bucket size so every
+        # remaining word is equally likely
+        letters = [
+            (letter, size) for letter, size in self.index.letters()
+            if letter not in self.first_letters
+        ]
+
+        total = sum(size for _, size in letters)
+        if total == 0:
+            return None
+
+        pick = self.rng.randrange(total)
+        for letter, size in letters:
+            if pick < size:
+                return letter
+            pick -= size
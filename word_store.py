@@ -0,0 +1,241 @@
+# word_store.py
+#
+# Containers for the falling words. ListWordStore is the plain list the game
+# always used, ArrayWordStore keeps positions, speeds and ids in NumPy arrays
+# so moving and ground checks are single vectorized operations.
+
+try:
+    import numpy as np
+except ImportError:     # optional, only needed for the stress difficulty
+    np = None
+
+INITIAL_CAPACITY = 256
+
+
+class FallingWord:
+    def __init__(self, text, x, y):
+        self.text = text
+        self.x = x
+        self.y = y
+        self.prev_y = y     # position one step ago, for interpolated drawing
+        self.speed = 1
+
+        # Cached render, filled in by the word renderer at spawn time
+        self.surface = None
+        self.highlight_len = 0
+        self.highlight_surface = None
+    
+    def move(self, speed):
+        self.prev_y = self.y
+        self.y += speed
+
+    def render_y(self, alpha):
+        return self.prev_y + (self.y - self.prev_y) * alpha
+
+
+class ListWordStore(list):
+    def add(self, text, x, y):
+        word = FallingWord(text, x, y)
+        self.append(word)
+        return word
+
+    def remove_many(self, words):
+        removed = set(map(id, words))
+        self[:] = [word for word in self if id(word) not in removed]
+
+    def move(self, speed, ground):
+        # Move every word, return the ones that reached the ground
+        landed = []
+        for word in self:
+            word.move(speed * word.speed)
+            if word.y >= ground:
+                landed.append(word)
+        return landed
+
+    def positions(self, alpha):
+        return [(int(word.x), int(word.render_y(alpha))) for word in self]
+
+
+class ArrayWord(FallingWord):
+    # FallingWord whose position lives in an ArrayWordStore slot. The slot
+    # changes when earlier words are removed, so it is looked up by id.
+    def __init__(self, store, word_id, text):
+        # Position and speed are already in the store's arrays
+        self.store = store
+        self.id = word_id
+        self.text = text
+
+        self.surface = None
+        self.highlight_len = 0
+        self.highlight_surface = None
+
+    @property
+    def slot(self):
+        return self.store.slot(self.id)
+
+    @property
+    def x(self):
+        return int(self.store.x[self.slot])
+
+    @x.setter
+    def x(self, value):
+        self.store.x[self.slot] = value
+
+    @property
+    def y(self):
+        return float(self.store.y[self.slot])
+
+    @y.setter
+    def y(self, value):
+        self.store.y[self.slot] = value
+
+    @property
+    def prev_y(self):
+        return float(self.store.prev_y[self.slot])
+
+    @prev_y.setter
+    def prev_y(self, value):
+        self.store.prev_y[self.slot] = value
+
+    @property
+    def speed(self):
+        return float(self.store.speed[self.slot])
+
+    @speed.setter
+    def speed(self, value):
+        self.store.speed[self.slot] = value
+
+
+class ArrayWordStore:
+    def __init__(self, capacity=INITIAL_CAPACITY):
+        if np is None:
+            raise ImportError("ArrayWordStore needs numpy")
+
+        self.count = 0
+        self.next_id = 0
+        self.words = []
+        self.allocate(capacity)
+
+        # Slot of every live word, indexed by id - id_base
+        self.id_base = 0
+        self.slots = np.zeros(capacity, dtype=np.int64)
+
+    def allocate(self, capacity):
+        def grow(old, dtype):
+            new = np.zeros(capacity, dtype=dtype)
+            if old is not None:
+                new[:self.count] = old[:self.count]
+            return new
+
+        self.x = grow(getattr(self, "x", None), np.int32)
+        self.y = grow(getattr(self, "y", None), np.float64)
+        self.prev_y = grow(getattr(self, "prev_y", None), np.float64)
+        self.speed = grow(getattr(self, "speed", None), np.float64)
+        self.ids = grow(getattr(self, "ids", None), np.int64)
+
+    def slot(self, word_id):
+        return int(self.slots[word_id - self.id_base])
+
+    def index_slots(self, start=0):
+        # Refresh the slot table from the ids array, rebasing it on the
+        # oldest live word so it stays about as long as the store
+        if self.next_id - self.id_base >= len(self.slots):
+            self.id_base = int(self.ids[:self.count].min()) if self.count else self.next_id
+            self.slots = np.zeros(max(INITIAL_CAPACITY, 2 * (self.next_id - self.id_base + 1)), dtype=np.int64)
+            start = 0
+        self.slots[self.ids[start:self.count] - self.id_base] = np.arange(start, self.count)
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return iter(self.words)
+
+    def __getitem__(self, i):
+        return self.words[i]
+
+    def add(self, text, x, y):
+        if self.count == len(self.x):
+            self.allocate(len(self.x) * 2)
+
+        slot = self.count
+        self.x[slot] = x
+        self.y[slot] = y
+        self.prev_y[slot] = y
+        self.speed[slot] = 1
+        self.ids[slot] = word_id = self.next_id
+        self.next_id += 1
+        self.count += 1
+        if word_id - self.id_base < len(self.slots):
+            self.slots[word_id - self.id_base] = slot
+        else:
+            self.index_slots()
+
+        word = ArrayWord(self, word_id, text)
+        self.words.append(word)
+        return word
+
+    def remove(self, word):
+        self.remove_many([word])
+
+    def remove_many(self, words):
+        # Compacts the arrays in one pass. Words keep their order, which is
+        # also the draw order, so overlapping words never change stacking.
+        if not words:
+            return
+
+        slots = sorted(word.slot for word in words)
+        for word in words:
+            # Detach first so the removed word keeps its last position
+            word.store = DetachedSlot(self, word.slot)
+
+        n = self.count
+        keep = np.ones(n, dtype=bool)
+        keep[slots] = False
+        first = slots[0]        # nothing before it moves
+        kept = np.flatnonzero(keep[first:]) + first
+        count = first + len(kept)
+        for array in (self.x, self.y, self.prev_y, self.speed, self.ids):
+            array[first:count] = array[kept]
+
+        for slot in reversed(slots):
+            del self.words[slot]
+        self.count = count
+        self.index_slots(first)
+
+    def clear(self):
+        for word in self.words:
+            word.store = DetachedSlot(self, word.slot)
+        self.words.clear()
+        self.count = 0
+
+    def move(self, speed, ground):
+        n = self.count
+        self.prev_y[:n] = self.y[:n]
+        self.y[:n] += self.speed[:n] * speed
+
+        landed = np.flatnonzero(self.y[:n] >= ground)
+        return [self.words[i] for i in landed]
+
+    def positions(self, alpha):
+        n = self.count
+        y = self.prev_y[:n] + (self.y[:n] - self.prev_y[:n]) * alpha
+        return np.column_stack((self.x[:n], y.astype(np.int32))).tolist()
+
+
+class DetachedSlot:
+    # One-slot stand-in so a removed ArrayWord still has a position
+    def __init__(self, store, slot):
+        self.x = [store.x[slot]]
+        self.y = [store.y[slot]]
+        self.prev_y = [store.prev_y[slot]]
+        self.speed = [store.speed[slot]]
+
+    def slot(self, word_id):
+        return 0
+
+
+def make_store(kind):
+    if kind == "array" and np is not None:
+        return ArrayWordStore()
+    return ListWordStore()
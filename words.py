@@ -1,4 +1,5 @@
-import random
+from word_sampler import WordIndex, WordSampler
+from word_pack import WordPack
 
 WORDS = [
     "python", "game", "keyboard", "speed", "typing", "logic", "screen",
@@ -7,13 +8,27 @@ WORDS = [
     "Thousand", "Extraordinary", "Personality", "words", "Random", "Police"
 ]
 
+# Shared index, each game keeps its own WordSampler over it
+word_index = WordIndex(WORDS)
+
+def load_word_pack(path):
+    # Swap the built-in list for a memory-mapped word pack
+    global word_index, _default_sampler
+    word_index = WordPack(path)
+    _default_sampler = new_sampler()
+
+def new_sampler(rng=None):
+    return WordSampler(word_index, rng)
+
+_default_sampler = new_sampler()
+
 def get_random_word(exclude=None):
     if exclude is None:
-        exclude = []
+        exclude = ()
 
-    available = [w for w in WORDS if w not in exclude]
+    word = _default_sampler.sample(exclude=set(exclude))
 
-    if not available:
-        return random.choice(WORDS)     #fallback (rare)
+    if word is None:
+        return _default_sampler.sample_any()     #fallback (rare)
     
-    return random.choice(available)
+    return word